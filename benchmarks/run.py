@@ -0,0 +1,154 @@
+"""
+Benchmark suite timing each phase of changelog processing on synthetic data.
+
+Run from the project root, e.g.::
+
+    python -m benchmarks.run --releases 1000 --families 3 --output out.json
+
+Results (plus the parameters & software versions used) are written as JSON,
+so separate runs can be compared over time.
+"""
+
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+import docutils
+import sphinx
+
+from releases import construct_nodes, construct_releases
+from releases._version import __version__
+from releases.util import (
+    _first_bullet_list,
+    get_docutils_doctree,
+    parse_changelog,
+)
+
+from .synthetic import SyntheticChangelog
+
+
+def _time(func, repeat, setup=None):
+    """
+    Run ``func`` ``repeat`` times, returning stats about its wall time.
+
+    If given, ``setup`` is called (untimed) before each run, and its return
+    value handed to ``func``.
+    """
+    runs = []
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        start = time.perf_counter()
+        func(*args)
+        runs.append(time.perf_counter() - start)
+    return {
+        "runs": runs,
+        "min": min(runs),
+        "median": statistics.median(runs),
+        "mean": statistics.mean(runs),
+    }
+
+
+def run(path, repeat, config):
+    """
+    Time every phase against the changelog file at ``path``.
+
+    :returns: A dict of phase names to timing stats (see `_time`).
+    """
+
+    def parsed():
+        return get_docutils_doctree(path, **config)
+
+    def constructed():
+        app, doctree = parsed()
+        first_list = _first_bullet_list(doctree)
+        return construct_releases(first_list.children, app)[0]
+
+    return {
+        # Docutils parse, i.e. mostly running our roles over every entry
+        "roles": _time(parsed, repeat),
+        "construct_releases": _time(
+            lambda x: construct_releases(
+                _first_bullet_list(x[1]).children, x[0]
+            ),
+            repeat,
+            setup=parsed,
+        ),
+        "construct_nodes": _time(construct_nodes, repeat, setup=constructed),
+        "parse_changelog": _time(
+            lambda: parse_changelog(path, **config), repeat
+        ),
+        "parse_changelog_docutils": _time(
+            lambda: parse_changelog(path, sphinx=False, **config), repeat
+        ),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--releases", type=int, default=200)
+    parser.add_argument("--families", type=int, default=2)
+    parser.add_argument(
+        "--mix",
+        default="6,3,1",
+        help="Relative weights of bug,feature,support entries",
+    )
+    parser.add_argument("--backported", type=float, default=0.1)
+    parser.add_argument("--major", type=float, default=0.05)
+    parser.add_argument("--spec", type=float, default=0.05)
+    parser.add_argument("--prehistory", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--output", help="File to write JSON results to (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+
+    params = dict(
+        releases=args.releases,
+        families=args.families,
+        mix=dict(
+            zip(("bug", "feature", "support"), map(int, args.mix.split(",")))
+        ),
+        backported=args.backported,
+        major=args.major,
+        spec=args.spec,
+        prehistory=args.prehistory,
+        seed=args.seed,
+    )
+    changelog = SyntheticChangelog(**params)
+    entries = changelog.entries()
+    config = {}
+    if args.prehistory:
+        config["unstable_prehistory"] = True
+    with TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "changelog.rst"
+        path.write_text(changelog.render(entries), encoding="utf-8")
+        phases = run(path, args.repeat, config)
+
+    result = {
+        "timestamp": time.time(),
+        "versions": {
+            "releases": __version__,
+            "python": platform.python_version(),
+            "sphinx": sphinx.__version__,
+            "docutils": docutils.__version__,
+        },
+        "params": params,
+        "entries": len(entries),
+        "repeat": args.repeat,
+        "phases": phases,
+    }
+    output = json.dumps(result, indent=2)
+    if args.output:
+        Path(args.output).write_text(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
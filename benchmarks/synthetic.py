@@ -0,0 +1,145 @@
+"""
+Generator for realistic, synthetic Releases changelogs of arbitrary size.
+"""
+
+import random
+from datetime import date, timedelta
+
+
+class SyntheticChangelog:
+    """
+    Simulates a project's history, oldest first, as a Releases changelog.
+
+    The timeline is a series of release "events": feature releases (bumping
+    the minor version of the newest major family), batches of bugfix releases
+    cut simultaneously for the newest few release lines, and - spread evenly
+    over the history - new major releases. A few issues land between each
+    event.
+
+    :param int releases: Approximate number of (stable) releases to generate.
+    :param int families: Number of major release families (1.x, 2.x, ...).
+    :param dict mix:
+        Relative weights of ``bug``, ``feature`` and ``support`` entries.
+    :param float backported:
+        Fraction of features/support items marked ``backported``.
+    :param float major: Fraction of bugs marked ``major``.
+    :param float spec: Fraction of bugs given an ``(N.N+)`` spec.
+    :param int prehistory:
+        Number of 0.x releases preceding 1.0.0; these get unlabeled entries,
+        as when converting a non-Releases changelog (use with the
+        ``releases_unstable_prehistory`` setting).
+    :param int lines:
+        How many of the newest release lines receive bugfix releases.
+    :param int issues_per_release: Max number of issues between releases.
+    :param int seed: Random seed, so runs are repeatable.
+    """
+
+    def __init__(
+        self,
+        releases=100,
+        families=2,
+        mix=None,
+        backported=0.1,
+        major=0.05,
+        spec=0.05,
+        prehistory=0,
+        lines=2,
+        issues_per_release=6,
+        seed=0,
+    ):
+        self.releases = releases
+        self.families = families
+        self.mix = mix or {"bug": 6, "feature": 3, "support": 1}
+        self.backported = backported
+        self.major = major
+        self.spec = spec
+        self.prehistory = prehistory
+        self.lines = lines
+        self.issues_per_release = issues_per_release
+        self.random = random.Random(seed)
+        self.number = 0
+        self.day = date(2010, 1, 1)
+
+    def _release(self, version):
+        self.day += timedelta(days=self.random.randint(1, 14))
+        return f":release:`{version} <{self.day.isoformat()}>`"
+
+    def _description(self):
+        words = self.random.randint(5, 40)
+        return " ".join(
+            self.random.choice(("Fix", "the", "``thing``", "when", "foo"))
+            for _ in range(words)
+        )
+
+    def _issue(self, newest_line):
+        self.number += 1
+        type_ = self.random.choices(
+            list(self.mix), weights=list(self.mix.values())
+        )[0]
+        keyword = ""
+        if type_ == "bug":
+            if self.random.random() < self.major:
+                keyword = " major"
+            elif newest_line and self.random.random() < self.spec:
+                keyword = f" ({newest_line}+)"
+        elif self.random.random() < self.backported:
+            keyword = " backported"
+        return f":{type_}:`{self.number}{keyword}` {self._description()}"
+
+    def _issues(self, newest_line=None, unlabeled=False):
+        count = self.random.randint(1, self.issues_per_release)
+        if unlabeled:
+            return [self._description() for _ in range(count)]
+        return [self._issue(newest_line) for _ in range(count)]
+
+    def entries(self):
+        """
+        Return the list of entry strings, newest first (as in a changelog).
+        """
+        timeline = []
+        for minor in range(1, self.prehistory + 1):
+            timeline.extend(self._issues(unlabeled=True))
+            timeline.append(self._release(f"0.{minor}.0"))
+        # Per-family [minor, patch] of each release line, newest line last
+        lines = {1: [[0, 0]]}
+        family = 1
+        timeline.append(self._release("1.0.0"))
+        per_family = max(self.releases // self.families, 1)
+        count = 1
+        while count < self.releases:
+            newest = lines[family][-1]
+            timeline.extend(self._issues(f"{family}.{newest[0]}"))
+            roll = self.random.random()
+            if count >= per_family * family and family < self.families:
+                family += 1
+                lines[family] = [[0, 0]]
+                timeline.append(self._release(f"{family}.0.0"))
+                count += 1
+            elif roll < 0.3:
+                lines[family].append([newest[0] + 1, 0])
+                timeline.append(self._release(f"{family}.{newest[0] + 1}.0"))
+                count += 1
+            else:
+                # Bugfix releases for the newest few lines of every family
+                # still around, cut at the same time.
+                for fam in sorted(lines):
+                    for line in lines[fam][-self.lines :]:
+                        line[1] += 1
+                        version = f"{fam}.{line[0]}.{line[1]}"
+                        timeline.append(self._release(version))
+                        count += 1
+        timeline.extend(self._issues(f"{family}.{lines[family][-1][0]}"))
+        return list(reversed(timeline))
+
+    def render(self, entries=None):
+        """
+        Return the changelog as ReST source text.
+
+        :param list entries:
+            Output of a previous `entries` call to render; by default, a new
+            history is generated.
+        """
+        if entries is None:
+            entries = self.entries()
+        items = "\n".join(f"- {entry}" for entry in entries)
+        return f"=========\nChangelog\n=========\n\n{items}\n"
@@ -1,3 +1,4 @@
+import json
 import os
 import shutil
 
@@ -106,6 +107,49 @@ class integration:
             conf_opts={"releases_debug": "1"},
         )
 
+    def parallel_build(self):
+        # Sphinx warns (and -W fails the build) if we're not declared safe for
+        # parallel reading; it only reads in parallel given >5 documents.
+        self._assert_worked(folder="parallel", extra_flags="-j 2")
+
+    def exports_changelog_data(self):
+        def asserts(result, build, target):
+            self._basic_asserts(result, build, target)
+            path = os.path.join(build, "changelog.releases.json")
+            with open(path) as fd:
+                data = json.load(fd)
+            release = data["releases"][-2]
+            assert release["number"] == "1.0.1"
+            assert release["entries"][0]["number"] == "1"
+
+        self._build(
+            folder="vanilla",
+            conf_opts={"releases_export": "json"},
+            extra_flags=None,
+            target="changelog",
+            asserts=asserts,
+        )
+
+    def archives_older_releases(self):
+        def asserts(result, build, target):
+            assert result.ok, result.stderr
+            with open(os.path.join(build, "changelog.html")) as fd:
+                main = fd.read()
+            assert 'href="changelog-1.html"' in main
+            with open(os.path.join(build, "changelog-1.html")) as fd:
+                archive = fd.read()
+            assert "Releases 1.0.0 to 1.0.1" in archive
+            assert 'id="1.0.1"' in archive and 'id="1.0.1"' not in main
+            assert 'id="1.0.2"' in main
+
+        self._build(
+            folder="unreleased_bugs",
+            conf_opts={"releases_archive": "2"},
+            extra_flags=None,
+            target="changelog",
+            asserts=asserts,
+        )
+
     def customized_filename_with_identical_title(self):
         # Changelog named not 'changelog', same title
         self._assert_worked(
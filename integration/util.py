@@ -10,7 +10,14 @@ from docutils.nodes import document
 from sphinx.application import Sphinx
 
 from releases.models import Release, Issue
-from releases.util import get_doctree, parse_changelog
+from releases.util import (
+    ChangelogParser,
+    get_doctree,
+    get_docutils_doctree,
+    iter_releases,
+    parse_changelog,
+    parse_changelogs,
+)
 
 
 support = os.path.join(os.path.dirname(__file__), "_support")
@@ -38,6 +45,25 @@ class get_doctree_:
         assert bug.number == "1"
 
 
+class get_docutils_doctree_:
+    def structures_doctree_like_sphinx_does(self):
+        _, expected = get_doctree(vanilla)
+        _, doctree = get_docutils_doctree(vanilla)
+        entries = doctree[0][2]
+        assert isinstance(entries[0][0][0], Release)
+        bug = entries[1][0][0]
+        assert isinstance(bug, Issue)
+        assert bug.number == "1"
+        assert len(entries) == len(expected[0][2])
+
+
+def _summarize(changelog):
+    return {
+        key: [(x.type, x.number) for x in value]
+        for key, value in changelog.items()
+    }
+
+
 class parse_changelog_:
     def yields_releases_dict_from_changelog_path(self):
         changelog = parse_changelog(vanilla)
@@ -57,6 +83,10 @@ class parse_changelog_:
         assert issue.number == "1"
         assert changelog["1.0"] == []  # emptied into 1.0.1
 
+    def values_are_plain_lists(self):
+        changelog = parse_changelog(unreleased_bugs)
+        assert all(type(x) is list for x in changelog.values())
+
     def unreleased_bugfixes_accounted_for(self):
         changelog = parse_changelog(unreleased_bugs)
         # Basic assertions
@@ -76,3 +106,80 @@ class parse_changelog_:
         assert len(line_11) == 1
         assert line_11[0].number == "3"
         assert line_11[0] is v102[0]
+
+    def can_return_a_query_index(self):
+        index = parse_changelog(unreleased_bugs, index=True)
+        assert index.changelog == parse_changelog(unreleased_bugs)
+        assert index.releases_containing(3) == ["1.0.2"]
+        assert [x.number for x in index.pending("1.1")] == ["3"]
+        assert index.lines_containing(3) == ["1.1"]
+
+    def docutils_only_parsing_gives_identical_results(self):
+        for path in (vanilla, unreleased_bugs):
+            expected = _summarize(parse_changelog(path))
+            assert _summarize(parse_changelog(path, sphinx=False)) == expected
+
+
+class ChangelogParser_:
+    def parses_many_files_like_parse_changelog(self):
+        for sphinx in (True, False):
+            parser = ChangelogParser(sphinx=sphinx)
+            for path in (vanilla, unreleased_bugs, vanilla):
+                expected = _summarize(parse_changelog(path))
+                assert _summarize(parser.parse(path)) == expected
+
+
+class parse_changelogs_:
+    def _test(self, workers):
+        missing = os.path.join(support, "nope", "changelog.rst")
+        results = parse_changelogs(
+            [unreleased_bugs, missing, vanilla], workers=workers
+        )
+        assert len(results) == 3
+        assert _summarize(results[0]) == _summarize(
+            parse_changelog(unreleased_bugs)
+        )
+        assert isinstance(results[1], Exception)
+        assert _summarize(results[2]) == _summarize(parse_changelog(vanilla))
+
+    def returns_results_in_order_with_errors_inline(self):
+        self._test(workers=2)
+
+    def single_worker_runs_in_process(self):
+        self._test(workers=1)
+
+    def results_survive_trip_from_worker_processes(self):
+        changelog = parse_changelogs([unreleased_bugs], workers=2)[0]
+        # Same issue object in both places, as with parse_changelog()
+        assert changelog["1.1"][0] is changelog["1.0.2"][0]
+        assert changelog["1.0.2"][0]["description"].astext() == " Aw jeez"
+
+
+class iter_releases_:
+    def yields_releases_newest_first(self):
+        releases = iter_releases(unreleased_bugs)
+        latest = next(releases)
+        assert latest.number == "1.0.2"
+        assert latest.date == "2016-10-18"
+        assert [x.number for x in latest.entries] == ["3"]
+        assert [x.number for x in releases] == ["1.1.0", "1.0.1", "1.0.0"]
+
+    def can_include_unreleased_pseudo_releases(self):
+        numbers = [
+            x.number for x in iter_releases(unreleased_bugs, unreleased=True)
+        ]
+        assert numbers[:2] == [
+            "unreleased_1.x_feature",
+            "unreleased_1.x_bugfix",
+        ]
+        assert numbers[2] == "1.0.2"
+
+    def reuses_checkpointed_history_given_cache_dir(self, tmpdir):
+        for sphinx in (True, False):
+            cache = tmpdir.join(str(sphinx))
+            first = list(iter_releases(vanilla, cache_dir=str(cache)))
+            assert cache.join("releases-checkpoints").listdir()
+            again = list(
+                iter_releases(vanilla, cache_dir=str(cache), sphinx=sphinx)
+            )
+            assert [x.number for x in again] == [x.number for x in first]
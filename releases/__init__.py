@@ -1,29 +1,51 @@
 import itertools
 import re
-import sys
-from functools import partial
+from functools import lru_cache
+from string import Formatter
+from typing import Any
 
 from docutils import nodes, utils
 from docutils.parsers.rst import roles
-
-from .models import Issue, ISSUE_TYPES, Release, Version, Spec
-from .line_manager import LineManager
+from sphinx import addnodes
+
+from .models import (
+    ENTRY_ORDER,
+    Issue,
+    ISSUE_TYPES,
+    PARSE_CACHE_SIZE,
+    Release,
+    parse_spec,
+    parse_version,
+)
+from .models import Spec, Version  # noqa: F401 (backwards compat re-export)
+from .line_manager import Bucket, LineManager
+from .checkpoints import CheckpointStore, CHECKPOINT_COUNT
+from . import profiling
+from .trace import tracer_for
+from .export import write_export
+from .archive import (
+    add_archive,
+    archive_links,
+    archive_mode,
+    archive_pagename,
+    archive_title,
+    collect_archive_pages,
+    reset_archives,
+    split_releases,
+    supports_archives,
+)
 from ._version import __version__
 
 
-def _log(txt, config):
-    """
-    Log debug output if debug setting is on.
-
-    Intended to be partial'd w/ config at top of functions. Meh.
-    """
-    if config.releases_debug:
-        print(txt, file=sys.stderr, flush=True)
+# Per-type "[Bug]" (etc) badge HTML; it never changes, so build it just once.
+_issue_badges = {
+    name: f'[<span style="color: #{color};">{name.capitalize()}</span>]'
+    for name, color in ISSUE_TYPES.items()
+}
 
 
 def issue_nodelist(name, identifier=None):
-    which = f'[<span style="color: #{ISSUE_TYPES[name]};">{name.capitalize()}</span>]'  # noqa
-    signifier = [nodes.raw(text=which, format="html")]
+    signifier = [nodes.raw(text=_issue_badges[name], format="html")]
     id_nodelist = [nodes.inline(text=" "), identifier] if identifier else []
     trail = [] if identifier else [nodes.inline(text=" ")]
     return signifier + id_nodelist + [nodes.inline(text=":")] + trail
@@ -32,21 +54,24 @@ def issue_nodelist(name, identifier=None):
 release_line_re = re.compile(r"^(\d+\.\d+)\+$")  # e.g. '1.2+'
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def scan_for_spec(keyword):
     """
     Attempt to return some sort of Spec from given keyword value.
 
-    Returns None if one could not be derived.
+    Returns None if one could not be derived. Results (including failures)
+    are memoized, since the same handful of keywords recur throughout a
+    changelog.
     """
     # Both 'spec' formats are wrapped in parens, discard
     keyword = keyword.lstrip("(").rstrip(")")
     # First, test for intermediate '1.2+' style
     matches = release_line_re.findall(keyword)
     if matches:
-        return Spec(f">={matches[0]}")
+        return parse_spec(f">={matches[0]}")
     # Failing that, see if Spec can make sense of it
     try:
-        return Spec(keyword)
+        return parse_spec(keyword)
     # I've only ever seen Spec fail with ValueError.
     except ValueError:
         return None
@@ -60,6 +85,107 @@ def interpolate(text, number):
     return text.format(number=number)
 
 
+class UriTemplate:
+    """
+    Precompiled ``releases_*_uri``-style template; call it with a number.
+
+    Results are identical to `interpolate`, but templates whose only
+    placeholders are ``%s`` or ``{number}`` get pre-split, so each call is a
+    plain string join.
+    """
+
+    def __init__(self, template):
+        self.template = template
+        self.pieces = self._split(template)
+
+    @staticmethod
+    def _split(template):
+        """
+        Return a list of literal strings & ``None`` (number) slots, or None.
+        """
+        if "%s" in template:
+            literals = template.split("%s")
+            # Anything else %-related (e.g. escapes) needs real interpolation
+            if any("%" in x for x in literals):
+                return None
+            pieces = [literals[0]]
+            for literal in literals[1:]:
+                pieces.extend((None, literal))
+            return pieces
+        pieces = []
+        try:
+            for literal, field, spec, conversion in Formatter().parse(
+                template
+            ):
+                pieces.append(literal)
+                if field is None:
+                    continue
+                if field != "number" or spec or conversion:
+                    return None
+                pieces.append(None)
+        except ValueError:
+            return None
+        return pieces
+
+    def __call__(self, number):
+        if self.pieces is None:
+            return interpolate(text=self.template, number=number)
+        return "".join(number if x is None else x for x in self.pieces)
+
+
+def _github_template(path, kind):
+    path = path.replace("{", "{{").replace("}", "}}")
+    return UriTemplate(f"https://github.com/{path}/{kind}/{{number}}")
+
+
+class RenderContext:
+    """
+    Per-build link-rendering state, compiled from ``releases_*`` settings.
+
+    Saves every single role invocation from re-examining the config. Use
+    `render_context` to obtain the one for a given app.
+    """
+
+    def __init__(self, config):
+        #: `UriTemplate` for issue links, or ``None`` if none configured.
+        self.issue_uri = None
+        if config.releases_issue_uri:
+            self.issue_uri = UriTemplate(config.releases_issue_uri)
+        elif config.releases_github_path:
+            self.issue_uri = _github_template(
+                config.releases_github_path, "issues"
+            )
+        #: `UriTemplate` for release links, or ``None`` if none configured.
+        self.release_uri = None
+        if config.releases_release_uri:
+            self.release_uri = UriTemplate(config.releases_release_uri)
+        elif config.releases_github_path:
+            self.release_uri = _github_template(
+                config.releases_github_path, "tree"
+            )
+
+
+def render_context(app):
+    """
+    Return ``app``'s `RenderContext`, creating it on first use.
+    """
+    context = getattr(app, "releases_render_context", None)
+    if context is None:
+        context = reset_render_context(app)
+    return context
+
+
+def reset_render_context(app, *args):
+    """
+    (Re)compile ``app``'s `RenderContext` from its current config.
+
+    Connected to ``builder-inited``, so each build starts with a fresh one.
+    """
+    app.releases_render_context = RenderContext(app.config)
+    return app.releases_render_context
+
+
+@profiling.timed("roles")
 def issues_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     """
     Use: :issue|bug|feature|support:`ticket_number`
@@ -78,13 +204,11 @@ def issues_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     parts = utils.unescape(text).split()
     issue_no = parts.pop(0)
     # Lol @ access back to Sphinx
-    config = inliner.document.settings.env.app.config
+    context = render_context(inliner.document.settings.env.app)
     if issue_no not in ("-", "0"):
         ref = None
-        if config.releases_issue_uri:
-            ref = interpolate(text=config.releases_issue_uri, number=issue_no)
-        elif config.releases_github_path:
-            ref = f"https://github.com/{config.releases_github_path}/issues/{issue_no}"  # noqa
+        if context.issue_uri:
+            ref = context.issue_uri(issue_no)
         # Only generate a reference/link if we were able to make a URI
         if ref:
             identifier = nodes.reference(
@@ -131,18 +255,14 @@ def issues_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
         return [identifier], []
 
 
-def release_nodes(text, slug, date, config):
+def release_nodes(text, slug, date, context):
     # Doesn't seem possible to do this "cleanly" (i.e. just say "make me a
     # title and give it these HTML attributes during render time) so...fuckit.
     # We were already doing fully raw elements elsewhere anyway. And who cares
     # about a PDF of a changelog? :x
-    uri = None
-    if config.releases_release_uri:
-        uri = interpolate(text=config.releases_release_uri, number=slug)
-    elif config.releases_github_path:
-        uri = f"https://github.com/{config.releases_github_path}/tree/{slug}"
     # Only construct link tag if user actually configured release URIs somehow
-    if uri:
+    if context.release_uri:
+        uri = context.release_uri(slug)
         link = f'<a class="reference external" href="{uri}">{text}</a>'
     else:
         link = text
@@ -158,6 +278,7 @@ def release_nodes(text, slug, date, config):
 year_arg_re = re.compile(r"^(.+?)\s*(?<!\x00)<(.*?)>$", re.DOTALL)
 
 
+@profiling.timed("roles")
 def release_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
     """
     Invoked as :release:`N.N.N <YYYY-MM-DD>`.
@@ -171,24 +292,28 @@ def release_role(name, rawtext, text, lineno, inliner, options={}, content=[]):
         return [inliner.problematic(rawtext, rawtext, msg)], [msg]
     number, date = match.group(1), match.group(2)
     # Lol @ access back to Sphinx
-    config = inliner.document.settings.env.app.config
-    nodelist = [release_nodes(number, number, date, config)]
+    context = render_context(inliner.document.settings.env.app)
+    nodelist = [release_nodes(number, number, date, context)]
     # Return intermediate node
-    node = Release(number=number, date=date, nodelist=nodelist)
+    node = Release(
+        number=number,
+        date=date,
+        nodelist=nodelist,
+        version=parse_version(number),
+    )
     return [node], []
 
 
 def generate_unreleased_entry(header, line, issues, manager, app):
-    log = partial(_log, config=app.config)
     nodelist = [
         release_nodes(
             header,
             app.config.releases_development_branch,
             None,
-            app.config,
+            render_context(app),
         )
     ]
-    log(f"Creating {line!r} faux-release with {issues!r}")
+    manager.trace.emit("unreleased_entry", line=line, issues=issues)
     return {
         "obj": Release(number=line, date=None, nodelist=nodelist),
         "entries": issues,
@@ -212,7 +337,7 @@ def append_unreleased_entries(app, manager, releases):
             bucket = f"unreleased_{type_}"
             if bucket not in lines:  # Implies unstable prehistory + 0.x fam
                 continue
-            issues = lines[bucket]
+            issues = lines[bucket].grouped()
             fam_prefix = f"{family}.x " if len(manager) > 1 else ""
             header = f"Next {fam_prefix}{type_} release"
             line = f"unreleased_{family}.x_{type_}"
@@ -221,31 +346,30 @@ def append_unreleased_entries(app, manager, releases):
             )
 
 
-def reorder_release_entries(releases):
+def group_entries(issues):
     """
-    Mutate ``releases`` so the entrylist in each is ordered by feature/bug/etc.
+    Return ``issues`` grouped by type (see `Bucket.grouped`), order preserved.
     """
-    order = {"feature": 0, "bug": 1, "support": 2}
-    for release in releases:
-        entries = release["entries"].copy()
-        release["entries"] = sorted(entries, key=lambda x: order[x.type])
+    groups = {type_: [] for type_ in ENTRY_ORDER}
+    for issue in issues:
+        groups[issue.type].append(issue)
+    return [x for group in groups.values() for x in group]
 
 
-def construct_entry_with_release(focus, issues, manager, log, releases, rest):
+def construct_entry_with_release(focus, issues, manager, releases, rest):
     """
     Releases 'eat' the entries in their line's list and get added to the
     final data structure. They also inform new release-line 'buffers'.
     Release lines, once the release obj is removed, should be empty or a
     comma-separated list of issue numbers.
     """
-    log(f"release for line {focus.minor!r}")
+    trace = manager.trace
     # Check for explicitly listed issues first
     explicit = None
     if rest[0].children:
         explicit = [x.strip() for x in rest[0][0].split(",")]
     # Do those by themselves since they override all other logic
     if explicit:
-        log(f"Explicit issues requested: {explicit!r}")
         # First scan global issue dict, dying if not found
         missing = [i for i in explicit if i not in issues]
         if missing:
@@ -253,12 +377,11 @@ def construct_entry_with_release(focus, issues, manager, log, releases, rest):
                 f"Couldn't find issue(s) #{', '.join(missing)} in the changelog!"  # noqa
             )
         # Obtain the explicitly named issues from global list
-        entries = []
-        for i in explicit:
-            for flattened_issue_item in itertools.chain(issues[i]):
-                entries.append(flattened_issue_item)
+        entries = group_entries(
+            itertools.chain.from_iterable(issues[i] for i in explicit)
+        )
         # Create release
-        log(f"entries in this release: {entries!r}")
+        trace.emit("explicit_release", release=focus, issues=entries)
         releases.append({"obj": focus, "entries": entries})
         # Introspect these entries to determine which buckets they should get
         # removed from (it's not "all of them"!)
@@ -266,26 +389,39 @@ def construct_entry_with_release(focus, issues, manager, log, releases, rest):
             if obj.type == "bug":
                 # Major bugfix: remove from unreleased_feature
                 if obj.major:
-                    log(f"Removing #{obj.number} from unreleased")
                     # TODO: consider making a LineManager method somehow
                     manager[focus.family]["unreleased_feature"].remove(obj)
+                    trace.emit(
+                        "issue_removed",
+                        issue=obj,
+                        family=focus.family,
+                        bucket="unreleased_feature",
+                    )
                 # Regular bugfix: remove from bucket for this release's
                 # line + unreleased_bugfix
                 else:
-                    if obj in manager[focus.family]["unreleased_bugfix"]:
-                        log(f"Removing #{obj.number} from unreleased")
-                        manager[focus.family]["unreleased_bugfix"].remove(obj)
-                    if obj in manager[focus.family][focus.minor]:
-                        log(f"Removing #{obj.number} from {focus.minor}")
-                        manager[focus.family][focus.minor].remove(obj)
+                    for bucket in ("unreleased_bugfix", focus.minor):
+                        if obj in manager[focus.family][bucket]:
+                            manager[focus.family][bucket].discard(obj)
+                            trace.emit(
+                                "issue_removed",
+                                issue=obj,
+                                family=focus.family,
+                                bucket=bucket,
+                            )
             # Regular feature/support: remove from unreleased_feature
             # Backported feature/support: remove from bucket for this
             # release's line (if applicable) + unreleased_feature
             else:
-                log(f"Removing #{obj.number} from unreleased")
                 manager[focus.family]["unreleased_feature"].remove(obj)
-                if obj in manager[focus.family].get(focus.minor, []):
-                    manager[focus.family][focus.minor].remove(obj)
+                trace.emit(
+                    "issue_removed",
+                    issue=obj,
+                    family=focus.family,
+                    bucket="unreleased_feature",
+                )
+                if focus.minor in manager[focus.family]:
+                    manager[focus.family][focus.minor].discard(obj)
 
     # Implicit behavior otherwise
     else:
@@ -295,28 +431,33 @@ def construct_entry_with_release(focus, issues, manager, log, releases, rest):
             # away with the subdicts + keys, move to sub-objects with methods
             # answering questions like "what should I give you for a release"
             # or whatever
-            log("in unstable prehistory, dumping 'unreleased'")
             releases.append(
                 {
                     "obj": focus,
                     # NOTE: explicitly dumping 0, not focus.family, since this
                     # might be the last pre-historical release and thus not 0.x
-                    "entries": manager[0]["unreleased"].copy(),
+                    "entries": manager[0]["unreleased"].grouped(),
                 }
             )
-            manager[0]["unreleased"] = []
+            trace.emit(
+                "release_consumed",
+                release=focus,
+                family=0,
+                bucket="unreleased",
+                issues=releases[-1]["entries"],
+            )
+            manager[0]["unreleased"] = Bucket()
             # If this isn't a 0.x release, it signals end of prehistory, make a
             # new release bucket (as is also done below in regular behavior).
             # Also acts like a sentinel that prehistory is over.
             if focus.family != 0:
-                manager[focus.family][focus.minor] = []
+                manager.add_line(focus.family, focus.minor)
         # Regular behavior from here
         else:
             # New release line/branch detected. Create it & dump unreleased
             # features.
             if focus.minor not in manager[focus.family]:
-                log("not seen prior, making feature release & bugfix bucket")
-                manager[focus.family][focus.minor] = []
+                manager.add_line(focus.family, focus.minor)
                 # TODO: this used to explicitly say "go over everything in
                 # unreleased_feature and dump if it's feature, support or major
                 # bug". But what the hell else would BE in unreleased_feature?
@@ -328,34 +469,46 @@ def construct_entry_with_release(focus, issues, manager, log, releases, rest):
                 releases.append(
                     {
                         "obj": focus,
-                        "entries": manager[focus.family]["unreleased_feature"][
-                            :
-                        ],
+                        "entries": manager[focus.family][
+                            "unreleased_feature"
+                        ].grouped(),
                     }
                 )
-                manager[focus.family]["unreleased_feature"] = []
+                trace.emit(
+                    "release_consumed",
+                    release=focus,
+                    family=focus.family,
+                    bucket="unreleased_feature",
+                    issues=releases[-1]["entries"],
+                )
+                manager[focus.family]["unreleased_feature"] = Bucket()
 
             # Existing line -> empty out its bucket into new release.
             # Skip 'major' bugs as those "belong" to the next release (and will
             # also be in 'unreleased_feature' - so safe to nuke the entire
             # line)
             else:
-                log("pre-existing, making bugfix release")
                 # TODO: as in other branch, I don't get why this wasn't just
                 # dumping the whole thing - why would major bugs be in the
                 # regular bugfix buckets?
-                entries = manager[focus.family][focus.minor].copy()
+                entries = manager[focus.family][focus.minor].grouped()
                 releases.append({"obj": focus, "entries": entries})
-                manager[focus.family][focus.minor] = []
+                trace.emit(
+                    "release_consumed",
+                    release=focus,
+                    family=focus.family,
+                    bucket=focus.minor,
+                    issues=entries,
+                )
+                manager[focus.family][focus.minor] = Bucket()
                 # Clean out the items we just released from
                 # 'unreleased_bugfix'.  (Can't nuke it because there might
                 # be some unreleased bugs for other release lines.)
                 for x in entries:
-                    if x in manager[focus.family]["unreleased_bugfix"]:
-                        manager[focus.family]["unreleased_bugfix"].remove(x)
+                    manager[focus.family]["unreleased_bugfix"].discard(x)
 
 
-def construct_entry_without_release(focus, issues, manager, log, rest):
+def construct_entry_without_release(focus, issues, manager, rest):
     # Handle rare-but-valid non-issue-attached line items, which are
     # always bugs. (They are their own description.)
     if not isinstance(focus, Issue):
@@ -376,7 +529,6 @@ lists.
 """
             raise ValueError(msg)
         # OK, it looks legit - make it a bug.
-        log("Found line item w/ no real issue object, creating bug")
         nodelist = issue_nodelist("bug")
         # Skip nodelist entirely if we're in unstable prehistory -
         # classification doesn't matter there.
@@ -386,6 +538,7 @@ lists.
         # to do this dumb shit uggggh
         rest[0].insert(0, focus)
         focus = Issue(type_="bug", nodelist=nodelist, description=rest)
+        manager.trace.emit("implicit_bug", issue=focus, text=rest)
     else:
         focus.attributes["description"] = rest
 
@@ -397,37 +550,55 @@ lists.
     # TODO: suspect all of add_to_manager can now live in the manager; most of
     # Release's methods should probably go that way
     if manager.unstable_prehistory:
-        log("Unstable prehistory -> adding to 0.x unreleased bucket")
         manager[0]["unreleased"].append(focus)
+        manager.trace.emit(
+            "issue_added", issue=focus, family=0, bucket="unreleased"
+        )
     else:
-        log("Adding to release line manager")
         focus.add_to_manager(manager)
 
 
-def handle_upcoming_major_release(entries, manager):
-    # Short-circuit if the future holds nothing for us
-    if not entries:
-        return
-    # Short-circuit if we're in the middle of a block of releases, only the
-    # last release before a bunch of issues, should be taking any action.
-    if isinstance(entries[0], Release):
-        return
-    # Iterate through entries til we find the next Release or set of Releases
-    next_releases = []
-    for index, obj in enumerate(entries):
+def index_release_blocks(entries):
+    """
+    Precompute major-release lookahead info for every position in ``entries``.
+
+    ``entries`` are the (oldest-first) stripped entry objects. Returns a list
+    of the same length, whose item N is a tuple of the major family numbers
+    introduced by the next block of releases after position N - or an empty
+    tuple when there's nothing to do, such as when N is itself in the middle
+    of a block of releases (only the last release before a bunch of issues
+    should take any action).
+
+    This is a single backwards pass, so the per-release lookahead done by
+    `handle_upcoming_major_release` is a constant-time lookup instead of a
+    forward scan over (a copy of) the rest of the changelog.
+    """
+    result = [()] * len(entries)
+    # Majors within the first block of releases at or after the position
+    # following the one currently being examined.
+    ahead = ()
+    following = None
+    for index in reversed(range(len(entries))):
+        obj = entries[index]
+        if not isinstance(following, Release):
+            result[index] = ahead
         if isinstance(obj, Release):
-            next_releases.append(obj)
-        # Non-empty next_releases + encountered a non-release = done w/ release
-        # block.
-        elif next_releases:
-            break
-    # Examine result: is a major release present? If so, add its major number
-    # to the line manager!
-    for obj in next_releases:
-        # TODO: update when Release gets tied closer w/ Version
-        version = Version(obj.number)
-        if version.minor == 0 and version.patch == 0:
-            manager.add_family(obj.family)
+            version = obj.version
+            own = ()
+            if version.minor == 0 and version.patch == 0:
+                own = (obj.family,)
+            # Contiguous releases belong to the same block
+            ahead = own + ahead if isinstance(following, Release) else own
+        following = obj
+    return result
+
+
+def handle_upcoming_major_release(families, manager):
+    """
+    Add upcoming major ``families`` (see `index_release_blocks`) to manager.
+    """
+    for family in families:
+        manager.add_family(family)
 
 
 def handle_first_release_line(entries, manager):
@@ -454,8 +625,159 @@ def handle_first_release_line(entries, manager):
         manager.add_family(0)
 
 
+def checkpoint_boundaries(entries):
+    """
+    Return indices of the (oldest-first) ``entries`` worth checkpointing at.
+
+    Those are releases followed by a non-release entry. State after a release
+    in the middle of a block of releases isn't self-contained: lookahead done
+    before the block already accounted for the rest of it. Checkpoints are
+    thus keyed by the digest covering the following entry too (see
+    `resume_from_checkpoint`), which pins down where the block ends.
+    """
+    return [
+        index
+        for index, obj in enumerate(entries[:-1])
+        if isinstance(obj, Release)
+        and not isinstance(entries[index + 1], Release)
+    ]
+
+
+def resume_from_checkpoint(
+    checkpoints, digests, boundaries, entries, issues, manager, releases
+):
+    """
+    Restore state from the newest usable checkpoint in ``checkpoints``.
+
+    ``boundaries`` are as returned by `checkpoint_boundaries`; the checkpoint
+    for boundary N is stored under the digest of entries up to N + 1.
+    Checkpoints are outlines (see `freeze_releases`), so the restored state is
+    built around this build's own ``entries`` (all oldest-first list items),
+    the first N + 1 of which get prepared as `thaw_releases` describes.
+    ``issues``, ``manager`` and ``releases`` are mutated in place.
+
+    :returns:
+        The index of the release entry the restored state ends with, or ``-1``
+        if no checkpoint matched (i.e. everything still needs processing).
+    """
+    for index in reversed(boundaries):
+        outline = checkpoints.load(digests[index + 1])
+        if outline is None:
+            continue
+        manager.trace.emit("checkpoint_resumed", index=index)
+        releases.extend(
+            thaw_releases(outline, entries[: index + 1], manager, issues)
+        )
+        return index
+    return -1
+
+
+def freeze_releases(stripped_entries, entries, releases, manager, issues=None):
+    """
+    Return a compact, picklable outline of `construct_releases`' results.
+
+    Issues & releases are recorded by their position in ``entries`` (the
+    oldest-first list items, with ``stripped_entries`` their original first
+    nodes), so `thaw_releases` can rebuild the results around a later build's
+    identical (but freshly parsed & resolved) entries. Only pseudo-releases
+    for unreleased entries, which don't come from the changelog, are stored
+    whole.
+
+    Also outlines the ``issues`` dict (issue number to issues), if given, as
+    needed to resume from partway through the changelog.
+
+    Raises `KeyError` if some issue didn't come from ``entries``, in which
+    case there's nothing to outline.
+    """
+    positions = {id(obj): index for index, obj in enumerate(stripped_entries)}
+    described = {id(obj): index for index, obj in enumerate(entries)}
+    implicit = {}
+
+    def position(issue):
+        index = positions.get(id(issue))
+        if index is None:
+            # Bug created for a plain list item, around its description
+            index = described[id(issue["description"])]
+            implicit[index] = bool(issue["nodelist"])
+        return index
+
+    outline = []
+    for release in releases:
+        obj = release["obj"]
+        index = positions.get(id(obj))
+        outline.append(
+            (
+                obj if index is None else index,
+                [position(x) for x in release["entries"]],
+            )
+        )
+    lines = {
+        family: {
+            key: [position(x) for x in bucket] for key, bucket in lines.items()
+        }
+        for family, lines in manager.items()
+    }
+    result = {"releases": outline, "manager": lines, "implicit": implicit}
+    if issues is not None:
+        result["issues"] = {
+            number: [position(x) for x in found]
+            for number, found in issues.items()
+        }
+    return result
+
+
+def thaw_releases(outline, entries, manager, issues=None):
+    """
+    Rebuild `construct_releases` results for ``entries`` from an ``outline``.
+
+    ``entries`` must be (oldest-first, unprocessed) entries identical to the
+    ones `freeze_releases` was given; they get the same treatment
+    `construct_releases` would give them (issue nodes popped off & handed
+    their descriptions), minus all the bucket logic. Fills in ``manager``
+    (and ``issues``, if given) and returns the list of releases.
+    """
+    objects = []
+    for index, obj in enumerate(entries):
+        focus = obj[0].pop(0)
+        if isinstance(focus, Issue):
+            focus.attributes["description"] = obj
+        elif not isinstance(focus, Release):
+            obj[0].insert(0, focus)
+            badge = outline["implicit"].get(index, True)
+            nodelist = issue_nodelist("bug") if badge else []
+            focus = Issue(type_="bug", nodelist=nodelist, description=obj)
+        objects.append(focus)
+    manager.restore(
+        {
+            family: {
+                key: [objects[x] for x in bucket]
+                for key, bucket in lines.items()
+            }
+            for family, lines in outline["manager"].items()
+        }
+    )
+    if issues is not None:
+        for number, positions in outline["issues"].items():
+            issues[number] = [objects[x] for x in positions]
+    return [
+        {
+            "obj": objects[obj] if isinstance(obj, int) else obj,
+            "entries": [objects[x] for x in positions],
+        }
+        for obj, positions in outline["releases"]
+    ]
+
+
+@profiling.timed("construct_releases")
 def construct_releases(entries, app):
-    log = partial(_log, config=app.config)
+    trace = tracer_for(app.config)
+    try:
+        return _construct_releases(entries, app, trace)
+    finally:
+        trace.flush()
+
+
+def _construct_releases(entries, app, trace):
     # Walk from back to front, consuming entries & copying them into
     # per-release buckets as releases are encountered. Store releases in order.
     releases = []
@@ -464,7 +786,7 @@ def construct_releases(entries, app):
     # NOTE: With exception of unstable_prehistory=True, which triggers use of a
     # separate, undifferentiated 'unreleased' bucket (albeit still within the
     # '0' major line family).
-    manager = LineManager(app)
+    manager = LineManager(app, trace=trace)
     # Also keep a master hash of issues by number to detect duplicates & assist
     # in explicitly defined release lists.
     issues = {}
@@ -474,32 +796,80 @@ def construct_releases(entries, app):
     # TODO: probs just merge the two into e.g. a list of 2-tuples of "actual
     # entry obj + rest"?
     stripped_entries = [x[0][0] for x in reversed_entries]
+    # With the whole-changelog cache on, an earlier build with identical
+    # entries & settings may have left us the complete results.
+    cache, digests = None, []
+    if app.config.releases_cache and entries:
+        cache = CheckpointStore.from_app(app, "releases-cache")
+        digests = cache.digests(reversed_entries)
+        outline = cache.load(digests[-1])
+        if outline is not None:
+            trace.emit("cache_hit", digest=digests[-1])
+            releases = thaw_releases(outline, reversed_entries, manager)
+            return releases, manager
     # Perform an initial lookahead to prime manager with the 1st major release
     handle_first_release_line(stripped_entries, manager)
+    # Precompute which major releases each release's lookahead will find
+    upcoming_majors = index_release_blocks(stripped_entries)
+    # When checkpointing, figure out which release boundaries to snapshot, and
+    # whether an earlier build already left us one we can resume from.
+    checkpoints, resume = None, -1
+    to_checkpoint = set()
+    if app.config.releases_checkpoints:
+        checkpoints = CheckpointStore.from_app(app)
+        digests = digests or checkpoints.digests(reversed_entries)
+        boundaries = checkpoint_boundaries(stripped_entries)
+        to_checkpoint = set(boundaries[-CHECKPOINT_COUNT:])
+        resume = resume_from_checkpoint(
+            checkpoints,
+            digests,
+            boundaries,
+            reversed_entries,
+            issues,
+            manager,
+            releases,
+        )
+        if resume >= 0:
+            handle_upcoming_major_release(upcoming_majors[resume], manager)
     # Start crawling...
     for index, obj in enumerate(reversed_entries):
+        # Entries already accounted for by a restored checkpoint
+        if index <= resume:
+            continue
+        profiling.count("entries_processed")
         # Issue object is always found in obj (LI) index 0 (first, often only
         # P) and is the 1st item within that (index 0 again).
         # Preserve all other contents of 'obj'.
         focus = obj[0].pop(0)
         rest = obj
-        log(repr(focus))
+        trace.emit("entry", index=index, obj=focus)
         # Releases 'eat' the entries in their line's list and get added to the
         # final data structure. They also inform new release-line 'buffers'.
         # Release lines, once the release obj is removed, should be empty or a
         # comma-separated list of issue numbers.
         if isinstance(focus, Release):
             construct_entry_with_release(
-                focus, issues, manager, log, releases, rest
+                focus, issues, manager, releases, rest
             )
+            # Snapshot prior to the lookahead below, as that depends on
+            # entries newer than this one (which may change between builds).
+            # Only releases ending a block qualify; see checkpoint_boundaries.
+            if index in to_checkpoint:
+                trace.emit("checkpoint_saved", index=index, release=focus)
+                outline = freeze_releases(
+                    stripped_entries[: index + 1],
+                    reversed_entries[: index + 1],
+                    releases,
+                    manager,
+                    issues,
+                )
+                checkpoints.save(digests[index + 1], outline)
             # After each release is handled, look ahead to see if we're
             # entering "last stretch before a major release". If so,
             # pre-emptively update the line-manager so upcoming features are
             # correctly sorted into that major release by default (re: logic in
             # Release.add_to_manager)
-            handle_upcoming_major_release(
-                stripped_entries[index + 1 :], manager
-            )
+            handle_upcoming_major_release(upcoming_majors[index], manager)
 
         # Entries get copied into release line buckets as follows:
         # * Features and support go into 'unreleased_feature' for use in new
@@ -517,14 +887,14 @@ def construct_releases(entries, app):
         # important!) is preserved by stuffing it into the focus (issue)
         # object - it will get unpacked by construct_nodes() later.
         else:
-            construct_entry_without_release(focus, issues, manager, log, rest)
+            construct_entry_without_release(focus, issues, manager, rest)
 
     if manager.unstable_prehistory:
         releases.append(
             generate_unreleased_entry(
                 header="Next release",
                 line="unreleased",
-                issues=manager[0]["unreleased"],
+                issues=manager[0]["unreleased"].grouped(),
                 manager=manager,
                 app=app,
             )
@@ -532,13 +902,138 @@ def construct_releases(entries, app):
     else:
         append_unreleased_entries(app, manager, releases)
 
-    reorder_release_entries(releases)
+    if cache is not None:
+        try:
+            outline = freeze_releases(
+                stripped_entries, reversed_entries, releases, manager
+            )
+        except KeyError:
+            pass
+        else:
+            cache.save(digests[-1], outline)
+            trace.emit("cache_saved", digest=digests[-1])
 
     return releases, manager
 
 
-def construct_nodes(releases):
+def render_entry(entry):
+    """
+    Turn issue ``entry`` into its final, displayable list item node.
+
+    This mutates & returns ``entry``'s own description node, instead of a
+    copy; callers needing more than one instance must copy the result. (It
+    also means each entry may only be rendered once.)
+    """
+    desc = entry["description"]
+    # Expand any other issue roles found in the description - sometimes we
+    # refer to related issues inline. (They can't be left as issue() objects at
+    # render time since that's undefined.)
+    # Use [:] slicing (even under modern Python; the objects here are docutils
+    # Nodes whose .copy() is weird) to avoid mutation during the loops.
+    for index, node in enumerate(desc[:]):
+        for subindex, subnode in enumerate(node[:]):
+            if isinstance(subnode, Issue):
+                lst = subnode["nodelist"]
+                desc[index][subindex : subindex + 1] = lst
+    # Rework this entry to insert the now-rendered issue nodes in front of the
+    # 1st paragraph of the 'description' nodes (which should be the preserved
+    # LI + nested paragraph-or-more from original markup.)
+    # FIXME: why is there no "prepend a list" method?
+    for node in reversed(entry["nodelist"]):
+        desc[0].insert(0, node)
+    return desc
+
+
+#: Nodes whose HTML depends on which document is being written; see
+#: `can_prerender`.
+_WRITE_TIME_NODES = (nodes.image, addnodes.download_reference)
+
+#: Marks where one pre-rendered entry list ends; see `prerender_lists`.
+_LIST_SEPARATOR = "<!-- releases: entry list -->"
+
+
+def _has_write_time_nodes(node):
+    # Plain stack walk; Node.traverse is several times slower & this checks
+    # every entry in the changelog.
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, _WRITE_TIME_NODES):
+            return True
+        if isinstance(node, nodes.Element):
+            stack.extend(node.children)
+    return False
+
+
+def can_prerender(app, releases):
+    """
+    Return whether `construct_nodes` may hand ``app`` pre-rendered HTML.
+
+    Only regular multi-page HTML builders qualify (others, like single-page
+    HTML or EPUB, rework doctrees after they're resolved), and only if no
+    entry in ``releases`` holds images or downloads, whose URLs aren't known
+    until each document gets written.
+    """
+    if app is None or app.builder.format != "html":
+        return False
+    if not supports_archives(app):
+        return False
+    return not any(
+        _has_write_time_nodes(entry["description"])
+        for release in releases
+        for entry in release["entries"]
+    )
+
+
+def prerender_lists(app, lists):
+    """
+    Render ``lists`` (entry bullet lists) to HTML, returning raw nodes.
+
+    Everything gets rendered in one go, with the same writer as the rest of
+    the page, then split back up. The result is equivalent to, but not always
+    byte-identical with, rendering as part of the page: ``render_partial``
+    applies docutils' own writer transforms (so e.g. admonitions get their
+    CSS classes in a different order).
+    """
+    container = nodes.container("")
+    for list_ in lists:
+        container += [nodes.raw("", _LIST_SEPARATOR, format="html"), list_]
+    container += nodes.raw("", _LIST_SEPARATOR, format="html")
+    html = app.builder.render_partial(container)["fragment"]
+    chunks = html.split(_LIST_SEPARATOR)[1:-1]
+    return [nodes.raw("", chunk, format="html") for chunk in chunks]
+
+
+@profiling.timed("construct_nodes")
+def construct_nodes(releases, rendered=None, app=None, prerender=None):
+    """
+    Return display nodes for ``releases``, newest first.
+
+    Issue descriptions are rendered in place (see `render_entry`), so this
+    consumes the `construct_releases` output it's given: call it only once
+    per such output.
+
+    :param dict rendered:
+        Issue descriptions already rendered by earlier calls over other parts
+        of the same `construct_releases` output (which must be handled newest
+        first); filled in as this call renders more.
+    :param app:
+        The Sphinx app being built for, if any. When `can_prerender` allows,
+        entry lists are returned as HTML rendered right away, so entries
+        appearing in several releases need no copies of their nodes.
+    :param bool prerender:
+        Overrides that `can_prerender` decision; callers sharing
+        ``rendered`` between calls must make the same choice for all of them,
+        lest a description node end up in two doctrees.
+    """
     result = []
+    # Each issue gets rendered only once, the first time it's encountered,
+    # reusing its original description node (which is otherwise discarded).
+    if rendered is None:
+        rendered = {}
+    if prerender is None:
+        prerender = can_prerender(app, releases)
+    sections, lists = [], []
     # Reverse the list again so the final display is newest on top
     for d in reversed(releases):
         if not d["entries"]:
@@ -546,51 +1041,67 @@ def construct_nodes(releases):
         obj = d["obj"]
         entries = []
         for entry in d["entries"]:
-            # Use nodes.Node.deepcopy to deepcopy the description
-            # node.  If this is not done, multiple references to the same
-            # object (e.g. a reference object in the description of #649, which
-            # is then copied into 2 different release lists) will end up in the
+            desc = rendered.get(id(entry))
+            if desc is None:
+                desc = rendered[id(entry)] = render_entry(entry)
+            # Use nodes.Node.deepcopy for any further appearances (unless
+            # prerendering, which can simply render the same node again). If
+            # this is not done, multiple references to the same object (e.g.
+            # a reference object in the description of #649, which is then
+            # copied into 2 different release lists) will end up in the
             # doctree, which makes subsequent parse steps very angry (index()
             # errors).
-            desc = entry["description"].deepcopy()
-            # Additionally, expand any other issue roles found in the
-            # description - sometimes we refer to related issues inline. (They
-            # can't be left as issue() objects at render time since that's
-            # undefined.)
-            # Use [:] slicing (even under modern Python; the objects here are
-            # docutils Nodes whose .copy() is weird) to avoid mutation during
-            # the loops.
-            for index, node in enumerate(desc[:]):
-                for subindex, subnode in enumerate(node[:]):
-                    if isinstance(subnode, Issue):
-                        lst = subnode["nodelist"]
-                        desc[index][subindex : subindex + 1] = lst
-            # Rework this entry to insert the now-rendered issue nodes in front
-            # of the 1st paragraph of the 'description' nodes (which should be
-            # the preserved LI + nested paragraph-or-more from original
-            # markup.)
-            # FIXME: why is there no "prepend a list" method?
-            for node in reversed(entry["nodelist"]):
-                desc[0].insert(0, node)
+            elif not prerender:
+                desc = desc.deepcopy()
+                profiling.count("deepcopies")
             entries.append(desc)
-        # Entry list
-        list_ = nodes.bullet_list("", *entries)
-        # Insert list into release nodelist (as it's a section)
-        obj["nodelist"][0].append(list_)
+        # Entry list, inserted into release nodelist (as it's a section)
+        sections.append(obj["nodelist"][0])
+        lists.append(nodes.bullet_list("", *entries))
         # Release header
         header = nodes.paragraph("", "", *obj["nodelist"])
         result.extend(header)
+    if prerender and lists:
+        lists = prerender_lists(app, lists)
+    for section, list_ in zip(sections, lists):
+        section.append(list_)
+    return result
+
+
+def construct_archived_nodes(app, docname, releases, mode):
+    """
+    Return the main page's display nodes, queueing the rest as archive pages.
+
+    See `releases.archive.split_releases` for how ``releases`` are divided
+    (per ``mode``); the main page ends with links to its archive pages.
+    """
+    rendered = {}
+    # Decided over all pages at once, as they share rendered descriptions
+    prerender = can_prerender(app, releases)
+    pages = split_releases(releases, mode)
+    result = construct_nodes(pages[0][1], rendered, app, prerender)
+    links = []
+    for label, subset in pages[1:]:
+        pagename = archive_pagename(docname, label)
+        title = archive_title(label, subset)
+        archived = construct_nodes(subset, rendered, app, prerender)
+        add_archive(app, docname, pagename, title, archived)
+        links.append((pagename, title))
+    if links:
+        result.append(archive_links(app, docname, links))
     return result
 
 
 class BulletListVisitor(nodes.NodeVisitor):
-    def __init__(self, document, app, docnames, is_singlepage):
+    def __init__(self, document, app, docnames, is_singlepage, docname=None):
         nodes.NodeVisitor.__init__(self, document)
         self.found_changelog = False
         self.app = app
         # document names to seek out (eg "changelog")
         self.docnames = docnames
         self.is_singlepage = is_singlepage
+        # name of the document being visited, if known (used for exports)
+        self.docname = docname
 
     def visit_bullet_list(self, node):
         # Short circuit if already mutated a changelog bullet list or if the
@@ -611,9 +1122,31 @@ class BulletListVisitor(nodes.NodeVisitor):
         # right one to mutate.
         self.found_changelog = True
         # Walk + parse into release mapping
-        releases, _ = construct_releases(node.children, self.app)
-        # Construct new set of nodes to replace the old, and we're done
-        node.replace_self(construct_nodes(releases))
+        releases, manager = construct_releases(node.children, self.app)
+        # Optionally hand the organized data to downstream tools
+        if self.app.config.releases_export:
+            docname = self.docname
+            if self.is_singlepage:
+                docname = node.parent.attributes["docname"]
+            write_export(self.app, docname, releases, manager)
+        # Construct new set of nodes to replace the old (optionally moving
+        # older releases onto archive pages), and we're done - so don't
+        # bother visiting the rest of the (possibly huge, e.g. in singlehtml
+        # builds) doctree.
+        mode = archive_mode(self.app.config)
+        if (
+            mode is None
+            or self.is_singlepage
+            or self.docname is None
+            or not supports_archives(self.app)
+        ):
+            new_nodes = construct_nodes(releases, app=self.app)
+        else:
+            new_nodes = construct_archived_nodes(
+                self.app, self.docname, releases, mode
+            )
+        node.replace_self(new_nodes)
+        raise nodes.StopTraversal
 
     def unknown_visit(self, node):
         pass
@@ -632,9 +1165,10 @@ def generate_changelog(app, doctree, docname):
     # Find an appropriate bullet-list node & replace it with our
     # organized/parsed elements.
     changelog_visitor = BulletListVisitor(
-        doctree, app, desired_docnames, is_singlepage
+        doctree, app, desired_docnames, is_singlepage, docname
     )
-    doctree.walk(changelog_visitor)
+    with profiling.phase("changelog_traversal"):
+        doctree.walk(changelog_visitor)
 
 
 def setup(app):
@@ -659,10 +1193,37 @@ def setup(app):
         # Whether to enable linear history during 0.x release timeline
         # TODO 3.0: flip this to True by default?
         ("unstable_prehistory", False),
+        # Whether to snapshot parsing state into the build dir, so later
+        # builds can skip re-parsing unchanged (older) parts of the changelog
+        ("checkpoints", False),
+        # Whether to cache the organized changelog in the build dir, so later
+        # builds (or other builders) with an unchanged changelog skip it all
+        ("cache", False),
     ):
         app.add_config_value(
             name=f"releases_{key}", default=default, rebuild="html"
         )
+    # Opt-in timing/counter report: True (write JSON into the output dir) or a
+    # callable receiving the report dict. Doesn't affect output, so no rebuild.
+    app.add_config_value(
+        name="releases_profile", default=False, rebuild="", types=Any
+    )
+    # Whether to also write organized changelog data into the output dir, as
+    # "json" (or True) or "ndjson"
+    app.add_config_value(
+        name="releases_export",
+        default=False,
+        rebuild="html",
+        types=[bool, str],
+    )
+    # Whether to move older releases onto generated archive pages: "family"
+    # (or True) for one page per major family, or N releases per page
+    app.add_config_value(
+        name="releases_archive",
+        default=False,
+        rebuild="html",
+        types=[bool, int, str],
+    )
     if isinstance(app.config.releases_document_name, str):
         app.config.releases_document_name = [app.config.releases_document_name]
 
@@ -670,11 +1231,26 @@ def setup(app):
     for x in list(ISSUE_TYPES) + ["issue"]:
         add_role(app, x, issues_role)
     add_role(app, "release", release_role)
+    # Compile link templates etc once per build
+    app.connect("builder-inited", reset_render_context)
     # Hook in our changelog transmutation at appropriate step
     app.connect("doctree-resolved", generate_changelog)
-
-    # identifies the version of our extension
-    return {"version": __version__}
+    # Optional archive pages for older releases
+    app.connect("builder-inited", reset_archives)
+    app.connect("html-collect-pages", collect_archive_pages)
+    # Optional instrumentation
+    app.connect("builder-inited", profiling.start_build_profile)
+    app.connect("build-finished", profiling.finish_build_profile)
+
+    # identifies the version of our extension. We keep no state in the build
+    # environment (so there's nothing to merge from parallel readers), our
+    # roles only build nodes, and changelog generation happens per-doctree at
+    # doctree-resolved time, which Sphinx runs in the main process.
+    return {
+        "version": __version__,
+        "parallel_read_safe": True,
+        "parallel_write_safe": True,
+    }
 
 
 def add_role(app, name, role_obj):
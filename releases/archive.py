@@ -0,0 +1,182 @@
+"""
+Splitting long changelogs over a main page plus generated archive pages.
+
+Enabled via the ``releases_archive`` setting. Releases are always organized
+over the complete history first; only the rendered output gets divided up.
+"""
+
+from html import escape
+
+from docutils import nodes
+
+
+#: ``releases_archive`` value meaning "one archive page per major family".
+FAMILY = "family"
+
+
+def archive_mode(config):
+    """
+    Return how ``releases_archive`` says to split changelogs, if at all.
+
+    That's either `FAMILY` (``True`` also means this) or the number of
+    releases per page; ``None`` (from ``False``, ``None`` or ``0``) means
+    not splitting at all. Raises `ValueError` for anything else.
+    """
+    setting = config.releases_archive
+    if setting is True or setting == FAMILY:
+        return FAMILY
+    # E.g. given via sphinx-build -D, which can't tell it's meant as a number
+    if isinstance(setting, str) and setting.isdigit():
+        setting = int(setting)
+    if setting is None or setting is False or setting == 0:
+        return None
+    if isinstance(setting, int) and setting > 0:
+        return setting
+    raise ValueError(
+        "releases_archive must be 'family' or a positive number of releases,"
+        f" not {setting!r}"
+    )
+
+
+def split_releases(releases, mode):
+    """
+    Divide `construct_releases` output into pages, given an `archive_mode`.
+
+    Returns a list of ``(label, releases)`` pairs, each holding a subset of
+    ``releases`` (still oldest first). The first, with a label of ``None``,
+    is the main page: it has every unreleased pseudo-release, plus either the
+    newest major family's releases (`FAMILY` mode) or the newest ``mode``
+    releases. The rest are archive pages, newest first, labeled with their
+    family (e.g. ``"1.x"``) or their 1-based position among the archives.
+    """
+    pending = [x for x in releases if x["obj"].minor is None]
+    released = [x for x in releases if x["obj"].minor is not None]
+    if mode == FAMILY:
+        families = {}
+        for release in released:
+            families.setdefault(release["obj"].family, []).append(release)
+        groups = [
+            (f"{family}.x", families[family])
+            for family in sorted(families, reverse=True)
+        ]
+    else:
+        groups = []
+        end = len(released)
+        while end > 0:
+            start = max(end - mode, 0)
+            groups.append((str(len(groups)), released[start:end]))
+            end = start
+    if not groups:
+        return [(None, pending)]
+    # Unreleased entries go above the newest releases, as usual
+    _, newest = groups[0]
+    return [(None, newest + pending)] + groups[1:]
+
+
+def archive_pagename(docname, label):
+    """
+    Return the name of ``docname``'s archive page labeled ``label``.
+    """
+    return f"{docname}-{label}"
+
+
+def archive_title(label, releases):
+    """
+    Return a human-readable title for an archive page.
+    """
+    if label.endswith(".x"):
+        return f"{label} releases"
+    newest, oldest = releases[-1]["obj"].number, releases[0]["obj"].number
+    if newest == oldest:
+        return f"Release {newest}"
+    return f"Releases {oldest} to {newest}"
+
+
+def archive_links(app, docname, archives):
+    """
+    Return nodes linking ``docname``'s main page to its ``archives``.
+
+    ``archives`` are ``(pagename, title)`` pairs.
+    """
+    items = [
+        nodes.list_item(
+            "",
+            nodes.paragraph(
+                "",
+                "",
+                nodes.reference(
+                    "",
+                    title,
+                    internal=True,
+                    refuri=app.builder.get_relative_uri(docname, pagename),
+                ),
+            ),
+        )
+        for pagename, title in archives
+    ]
+    return nodes.section(
+        "",
+        nodes.title("", "Older releases"),
+        nodes.bullet_list("", *items),
+        ids=["releases-archive"],
+    )
+
+
+def supports_archives(app):
+    """
+    Return whether ``app``'s builder can write archive pages.
+
+    Only regular multi-page HTML builders can; others (e.g. LaTeX, EPUB or
+    single-page HTML) get the entire changelog in one document instead.
+    """
+    builder = app.builder
+    # Duck-typed, as RTD's builders don't all inherit from Sphinx's own
+    return (
+        hasattr(builder, "gen_pages_from_extensions")
+        and not getattr(builder, "embedded", False)
+        and "singlehtml" not in builder.name
+    )
+
+
+def reset_archives(app, *args):
+    """
+    Forget archive pages from any previous build.
+
+    Connected to ``builder-inited``.
+    """
+    app.releases_archives = {}
+
+
+def add_archive(app, docname, pagename, title, release_nodes):
+    """
+    Queue an archive page for ``docname``, written by `collect_archive_pages`.
+    """
+    if not hasattr(app, "releases_archives"):
+        reset_archives(app)
+    app.releases_archives[pagename] = (docname, title, release_nodes)
+
+
+def collect_archive_pages(app):
+    """
+    Yield archive pages queued during this build, for the HTML builder.
+
+    Connected to ``html-collect-pages``; this runs in the main process after
+    all documents (and hence all changelogs) have been written.
+    """
+    archives = getattr(app, "releases_archives", {})
+    for pagename, (docname, title, release_nodes) in archives.items():
+        main_title = app.env.titles[docname].astext()
+        uri = app.builder.get_relative_uri(pagename, docname)
+        container = nodes.container("", *release_nodes)
+        body = app.builder.render_partial(container)["fragment"]
+        link = f'<a class="reference internal" href="{escape(uri)}">'
+        context = {
+            "parents": [{"link": uri, "title": escape(main_title)}],
+            "title": escape(f"{main_title}: {title}"),
+            "body": (
+                f"<h1>{escape(main_title)}: {escape(title)}</h1>\n"
+                f"<p>Newer releases: {link}{escape(main_title)}</a></p>\n"
+                f"{body}"
+            ),
+        }
+        yield (pagename, context, "page.html")
@@ -0,0 +1,205 @@
+"""
+On-disk checkpoints of `construct_releases` state, for resuming changelogs.
+
+Changelogs only ever grow at the top, so the state Releases builds up while
+walking from the oldest entry upwards is, for the older part of the file,
+identical from one build to the next. Snapshotting that state at a few release
+boundaries lets a later build skip straight to the newest unchanged boundary.
+"""
+
+import copyreg
+import hashlib
+import io
+import os
+import pickle
+
+from docutils import nodes
+
+from ._version import __version__
+
+
+#: How many of the newest release boundaries get checkpointed per build.
+CHECKPOINT_COUNT = 3
+
+#: Settings which don't affect parsing, so are left out of digests.
+IGNORED_SETTINGS = (
+    "releases_cache",
+    "releases_checkpoints",
+    "releases_debug",
+    "releases_profile",
+)
+
+#: How many checkpoint files to keep around on disk (oldest get pruned).
+CHECKPOINT_LIMIT = 20
+
+
+def _rebuild_node(cls, args, state):
+    node = cls.__new__(cls, *args)
+    node.__dict__.update(state)
+    # Children were pickled without their parent pointers; restore them.
+    for child in getattr(node, "children", []):
+        child.parent = node
+    return node
+
+
+def _reduce_node(node):
+    # Drop parent & document pointers, which would otherwise drag the entire
+    # doctree (and the Sphinx environment hanging off of it) into the pickle.
+    state = {
+        key: value
+        for key, value in node.__dict__.items()
+        if key not in ("parent", "_document")
+    }
+    args = (str(node),) if isinstance(node, nodes.Text) else ()
+    return _rebuild_node, (node.__class__, args, state)
+
+
+def _node_classes(cls=nodes.Node):
+    yield cls
+    for subclass in cls.__subclasses__():
+        yield from _node_classes(subclass)
+
+
+def dumps(state):
+    """
+    Pickle ``state``, detaching any docutils nodes from their doctree.
+    """
+    buf = io.BytesIO()
+    pickler = pickle.Pickler(buf, protocol=pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = copyreg.dispatch_table.copy()
+    for cls in _node_classes():
+        pickler.dispatch_table[cls] = _reduce_node
+    pickler.dump(state)
+    return buf.getvalue()
+
+
+def entry_fingerprint(entry):
+    """
+    Return a string uniquely identifying the content of changelog ``entry``.
+
+    Entries parsed from real ReST files carry their source text; ones built
+    by hand (e.g. in tests) fall back to their pseudo-XML representation.
+    """
+    return entry.rawsource or entry.pformat()
+
+
+def least_recently_used(directory, suffix, keep):
+    """
+    Return paths of ``suffix`` files in ``directory``, bar the ``keep`` newest.
+
+    Files may vanish meanwhile (e.g. pruned by a concurrent build sharing the
+    directory); those are simply skipped.
+    """
+    found = []
+    for name in os.listdir(directory):
+        if not name.endswith(suffix):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            found.append((os.path.getmtime(path), path))
+        except FileNotFoundError:
+            pass
+    found.sort(reverse=True)
+    return [path for _, path in found[keep:]]
+
+
+class CheckpointStore:
+    """
+    Directory of pickled `construct_releases` states, keyed by content digest.
+    """
+
+    def __init__(self, directory, config):
+        """
+        :param str directory: Where to read & write checkpoint files.
+        :param config:
+            Sphinx config object; its ``releases_*`` values (bar
+            `IGNORED_SETTINGS`) are part of every digest, since they affect
+            how entries get parsed and organized.
+        """
+        self.directory = directory
+        names = sorted(
+            x
+            for x in config.values
+            if x.startswith("releases_") and x not in IGNORED_SETTINGS
+        )
+        settings = [(name, getattr(config, name)) for name in names]
+        self.salt = f"{__version__}:{settings!r}".encode()
+
+    @classmethod
+    def from_app(cls, app, name="releases-checkpoints"):
+        """
+        Return a store living inside ``app``'s doctree (build) directory.
+
+        :param str name: Subdirectory to use; defaults to checkpoints' own.
+
+        Raises `ValueError` if ``app`` has no doctree directory (e.g. a
+        `~releases.util.DocutilsApp` created without a ``doctreedir``).
+        """
+        if app.doctreedir is None:
+            raise ValueError(
+                "releases_checkpoints and releases_cache need somewhere to"
+                " store their files; give a doctreedir!"
+            )
+        directory = os.path.join(str(app.doctreedir), name)
+        return cls(directory, app.config)
+
+    def digests(self, entries):
+        """
+        Return rolling digests for ``entries`` (given oldest-first).
+
+        The digest at index N covers entry N and every entry before it, so it
+        only matches a previous build if none of those entries changed.
+        """
+        digest = hashlib.sha1(self.salt)
+        result = []
+        for entry in entries:
+            digest.update(entry_fingerprint(entry).encode())
+            result.append(digest.hexdigest())
+        return result
+
+    def _path(self, digest):
+        return os.path.join(self.directory, f"{digest}.pickle")
+
+    def load(self, digest):
+        """
+        Return the state stored under ``digest``, or ``None`` if there is none.
+        """
+        path = self._path(digest)
+        try:
+            with open(path, "rb") as fd:
+                state = pickle.load(fd)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return None
+        # Mark as recently used so pruning keeps it around.
+        try:
+            os.utime(path)
+        except FileNotFoundError:  # Pruned by a concurrent build meanwhile
+            pass
+        return state
+
+    def save(self, digest, state):
+        """
+        Store ``state`` (anything `dumps` can handle) under ``digest``.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(digest)
+        if not os.path.exists(path):
+            # Write-then-rename, so concurrent builds sharing a doctree dir
+            # never see (or clobber each other with) partial files.
+            temp = f"{path}.{os.getpid()}.tmp"
+            with open(temp, "wb") as fd:
+                fd.write(dumps(state))
+            os.replace(temp, path)
+        self.prune()
+
+    def prune(self):
+        """
+        Remove all but the `CHECKPOINT_LIMIT` most recently used checkpoints.
+        """
+        for path in least_recently_used(
+            self.directory, ".pickle", CHECKPOINT_LIMIT
+        ):
+            try:
+                os.remove(path)
+            except FileNotFoundError:  # Another build beat us to it
+                pass
@@ -0,0 +1,304 @@
+"""
+``releases`` command-line tool, for querying changelogs from scripts.
+
+E.g.::
+
+    releases list docs/changelog.rst
+    releases show docs/changelog.rst 1.2.3
+    releases unreleased docs/changelog.rst --json
+    releases find docs/changelog.rst 123
+
+Organized changelog data is cached on disk, keyed by a hash of the file's
+contents (plus settings), so repeat queries against an unchanged changelog
+skip parsing entirely.
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+
+from ._version import __version__
+
+
+#: How many cached changelogs to keep around on disk (oldest get pruned).
+CACHE_LIMIT = 50
+
+
+def default_cache_dir():
+    """
+    Return the default cache directory, honoring ``$XDG_CACHE_HOME``.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(base, "releases")
+
+
+def cache_key(content, sphinx, settings):
+    """
+    Return the cache key for changelog ``content`` (bytes) & parse options.
+    """
+    digest = hashlib.sha1(
+        f"{__version__}:{sphinx}:{sorted(settings.items())!r}:".encode()
+    )
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def prune_cache(cache_dir):
+    """
+    Remove all but the `CACHE_LIMIT` most recently used files in the cache.
+    """
+    from .checkpoints import least_recently_used
+
+    for path in least_recently_used(cache_dir, ".json", CACHE_LIMIT):
+        try:
+            os.remove(path)
+        except FileNotFoundError:  # Another process beat us to it
+            pass
+
+
+def load_changelog(path, cache_dir=None, sphinx=False, **settings):
+    """
+    Return organized data for the changelog at ``path``, cached if possible.
+
+    The data is a dict with ``releases`` & ``buckets`` keys, as per
+    `releases.export.changelog_records`.
+
+    :param str cache_dir:
+        Where to keep cached results; ``None`` disables caching.
+    :param bool sphinx:
+        Whether to parse with Sphinx instead of plain docutils; see
+        `releases.util.parse_changelog`.
+
+    Any additional kwargs become ``releases_*`` settings.
+    """
+    content = Path(path).read_bytes()
+    cache_path = None
+    if cache_dir is not None:
+        key = cache_key(content, sphinx, settings)
+        cache_path = os.path.join(cache_dir, f"{key}.json")
+        try:
+            with open(cache_path) as fd:
+                data = json.load(fd)
+        except (OSError, ValueError):
+            pass
+        else:
+            # Mark as recently used so pruning keeps it around.
+            try:
+                os.utime(cache_path)
+            except FileNotFoundError:  # Pruned by a concurrent job meanwhile
+                pass
+            return data
+    # Only now pay for importing (and starting) the parsing machinery
+    from . import construct_releases
+    from .export import changelog_records
+    from .util import ChangelogParser, _first_bullet_list
+
+    parser = ChangelogParser(sphinx=sphinx, **settings)
+    entries = _first_bullet_list(parser.get_doctree(path)).children
+    records, buckets = changelog_records(
+        *construct_releases(entries, parser.app)
+    )
+    data = {"releases": records, "buckets": buckets}
+    if cache_path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write-then-rename, so concurrent CI jobs never read partial files
+        temp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(temp, "w") as fd:
+            json.dump(data, fd)
+        os.replace(temp, cache_path)
+        prune_cache(cache_dir)
+    return data
+
+
+def pending_lines(data):
+    """
+    Return ``{line: [issue records]}`` of unreleased entries per line.
+
+    Lines are release lines such as ``"1.2"`` (pending bugfixes) and
+    ``"N.x"`` (pending features for the next ``N.x`` feature release); as
+    with `releases.util.parse_changelog`, ``unreleased_bugfix`` buckets are
+    left out since their contents also sit in the per-line buckets.
+    """
+    result = {}
+    for family, lines in data["buckets"].items():
+        for key, issues in lines.items():
+            if key == "unreleased_bugfix":
+                continue
+            if key.startswith("unreleased"):
+                key = f"{family}.x"
+            result[key] = issues
+    return result
+
+
+def _format_issue(issue):
+    number = f"#{issue['number']}" if issue["number"] else "-"
+    flags = [x for x in ("backported", "major") if issue[x]]
+    if issue["spec"]:
+        flags.append(issue["spec"])
+    flag = f" ({', '.join(flags)})" if flags else ""
+    text = f" {issue['description']}" if issue["description"] else ""
+    return f"[{issue['type']}] {number}{flag}{text}"
+
+
+def _find_release(data, number):
+    for release in data["releases"]:
+        if release["number"] == number:
+            return release
+    return None
+
+
+def list_releases(data, args):
+    releases = [
+        {"number": x["number"], "date": x["date"], "line": x["line"]}
+        for x in data["releases"]
+        if args.unreleased or not x["unreleased"]
+    ]
+    if args.json:
+        return releases
+    for release in releases:
+        print(release["number"] or release["line"], release["date"] or "")
+    return None
+
+
+def show_release(data, args):
+    release = _find_release(data, args.version)
+    if release is None:
+        raise LookupError(f"No release {args.version!r} in the changelog!")
+    if args.json:
+        return release
+    for issue in release["entries"]:
+        print(_format_issue(issue))
+    return None
+
+
+def show_unreleased(data, args):
+    lines = pending_lines(data)
+    if args.json:
+        return lines
+    for line, issues in lines.items():
+        print(f"{line}:")
+        for issue in issues:
+            print(f"  {_format_issue(issue)}")
+    return None
+
+
+def find_issue(data, args):
+    number = args.issue.lstrip("#")
+    releases = [
+        x["number"] or x["line"]
+        for x in data["releases"]
+        if any(issue["number"] == number for issue in x["entries"])
+    ]
+    if args.json:
+        return releases
+    for release in releases:
+        print(release)
+    return None
+
+
+def _setting(text):
+    """
+    Parse a ``-D name=value`` setting; values are Python literals or strings.
+    """
+    name, _, value = text.partition("=")
+    name = name.strip()
+    if name.startswith("releases_"):
+        name = name[len("releases_") :]
+    try:
+        value = ast.literal_eval(value)
+    except (SyntaxError, ValueError):
+        pass
+    return name, value
+
+
+def make_parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("changelog", help="Path to the changelog file")
+    common.add_argument(
+        "--json", action="store_true", help="Emit results as JSON"
+    )
+    common.add_argument(
+        "-D",
+        dest="settings",
+        action="append",
+        type=_setting,
+        default=[],
+        metavar="NAME=VALUE",
+        help="Set releases_NAME (e.g. -D unstable_prehistory=True)",
+    )
+    common.add_argument(
+        "--sphinx",
+        action="store_true",
+        help="Parse with Sphinx instead of plain docutils (slower)",
+    )
+    common.add_argument(
+        "--cache-dir",
+        default=default_cache_dir(),
+        help="Where to cache parsed changelogs (default: %(default)s)",
+    )
+    common.add_argument(
+        "--no-cache",
+        dest="cache_dir",
+        action="store_const",
+        const=None,
+        help="Don't read or write cached results",
+    )
+    parser = argparse.ArgumentParser(
+        prog="releases", description=__doc__.splitlines()[1]
+    )
+    parser.add_argument("--version", action="version", version=__version__)
+    commands = parser.add_subparsers(dest="command", required=True)
+    command = commands.add_parser(
+        "list", parents=[common], help="List releases, newest first"
+    )
+    command.add_argument(
+        "--unreleased",
+        action="store_true",
+        help="Include unreleased pseudo-releases",
+    )
+    command.set_defaults(func=list_releases)
+    command = commands.add_parser(
+        "show", parents=[common], help="Show the entries in one release"
+    )
+    command.add_argument("version", help="Release number, e.g. 1.2.3")
+    command.set_defaults(func=show_release)
+    command = commands.add_parser(
+        "unreleased",
+        parents=[common],
+        help="Show unreleased entries per release line",
+    )
+    command.set_defaults(func=show_unreleased)
+    command = commands.add_parser(
+        "find", parents=[common], help="List releases containing an issue"
+    )
+    command.add_argument("issue", help="Issue number, e.g. 123")
+    command.set_defaults(func=find_issue)
+    return parser
+
+
+def main(argv=None):
+    args = make_parser().parse_args(argv)
+    try:
+        data = load_changelog(
+            args.changelog,
+            cache_dir=args.cache_dir,
+            sphinx=args.sphinx,
+            **dict(args.settings),
+        )
+        result = args.func(data, args)
+    except (OSError, LookupError, ValueError) as e:
+        print(f"releases: {e}", file=sys.stderr)
+        return 1
+    if args.json:
+        print(json.dumps(result, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Machine-readable export of organized changelogs, written during builds.
+
+Enabled via the ``releases_export`` setting, so downstream tools can read the
+data Releases already computed instead of re-parsing the changelog.
+"""
+
+import json
+import os
+
+
+#: Supported ``releases_export`` formats (also used as file extensions).
+FORMATS = ("json", "ndjson")
+
+
+def issue_record(issue):
+    """
+    Return a JSON-friendly dict describing ``issue``.
+
+    Includes the plain text of its ``description``, if it has one yet.
+    """
+    spec = issue.spec
+    description = issue.get("description", None)
+    return {
+        "number": issue.number,
+        "type": issue.type,
+        "backported": issue.backported,
+        "major": issue.major,
+        "spec": str(spec) if spec else None,
+        "description": (
+            None if description is None else description.astext().strip()
+        ),
+    }
+
+
+def release_record(release):
+    """
+    Return a JSON-friendly dict for one of `construct_releases`' releases.
+
+    ``line`` is the release line (e.g. ``"1.2"``) a real release belongs to,
+    or the bucket name of an unreleased pseudo-release (e.g.
+    ``"unreleased_1.x_bugfix"``).
+    """
+    obj = release["obj"]
+    unreleased = obj.minor is None
+    return {
+        "number": None if unreleased else obj.number,
+        "date": obj.get("date", None),
+        "line": obj.number if unreleased else obj.minor,
+        "unreleased": unreleased,
+        "entries": [issue_record(x) for x in release["entries"]],
+    }
+
+
+def changelog_records(releases, manager):
+    """
+    Return ``(releases, buckets)`` records for `construct_releases` output.
+
+    Releases come newest first, as they're displayed. ``buckets`` maps each
+    major family (as a string) to its line manager buckets, each a list of
+    the issue records still sitting in it at the end of the changelog.
+    """
+    records = [release_record(x) for x in reversed(releases)]
+    buckets = {
+        str(family): {
+            key: [issue_record(x) for x in bucket]
+            for key, bucket in lines.items()
+        }
+        for family, lines in manager.items()
+    }
+    return records, buckets
+
+
+def export_path(app, docname):
+    """
+    Return where the export for changelog document ``docname`` goes.
+    """
+    format_ = export_format(app.config)
+    return os.path.join(str(app.outdir), f"{docname}.releases.{format_}")
+
+
+def export_format(config):
+    """
+    Return the export format selected by ``releases_export``, if any.
+
+    ``True`` means ``"json"``; raises `ValueError` for unknown formats.
+    """
+    setting = config.releases_export
+    if not setting:
+        return None
+    format_ = "json" if setting is True else setting
+    if format_ not in FORMATS:
+        raise ValueError(
+            f"releases_export must be one of {FORMATS}, not {setting!r}"
+        )
+    return format_
+
+
+def write_export(app, docname, releases, manager):
+    """
+    Write `construct_releases` output for ``docname`` into the output dir.
+
+    JSON exports are a single object with ``releases`` & ``buckets`` keys
+    (see `changelog_records`). NDJSON exports have one release per line,
+    followed by one ``{"family": ..., "buckets": ...}`` line per family.
+    """
+    format_ = export_format(app.config)
+    records, buckets = changelog_records(releases, manager)
+    path = export_path(app, docname)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as fd:
+        if format_ == "json":
+            json.dump({"releases": records, "buckets": buckets}, fd, indent=2)
+        else:
+            for record in records:
+                fd.write(json.dumps(record) + "\n")
+            for family, lines in buckets.items():
+                fd.write(json.dumps({"family": family, "buckets": lines}))
+                fd.write("\n")
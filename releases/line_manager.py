@@ -1,3 +1,108 @@
+from bisect import insort
+
+from . import profiling
+from .models import ENTRY_ORDER, parse_version
+from .trace import NULL_TRACER
+
+
+class Bucket:
+    """
+    Insertion-ordered collection of issues, as held in `LineManager` buckets.
+
+    Quacks enough like the plain lists buckets used to be (``append``,
+    ``remove``, iteration, indexing, comparison against lists) while making
+    membership tests & removal O(1) instead of linear scans.
+
+    Members are tracked by object identity, not `Issue.__eq__`: the same
+    issue object is what gets added to, and later consumed from, each bucket,
+    and two distinct entries which happen to compare equal (e.g. multiple
+    un-numbered bugs) must both survive. Like a list, the same object may
+    still be appended more than once.
+
+    Members are also kept partitioned by issue type, so `grouped` can hand
+    releases their entries in display order without any sorting.
+    """
+
+    __slots__ = ("_items", "_tokens", "_typed", "_next")
+
+    def __init__(self, items=()):
+        # Insertion token -> item, plus item identity -> its tokens (oldest
+        # first, mirroring list.remove() taking out the first occurrence).
+        self._items = {}
+        self._tokens = {}
+        # Issue type -> {token: item}, in ENTRY_ORDER
+        self._typed = {type_: {} for type_ in ENTRY_ORDER}
+        self._next = 0
+        for item in items:
+            self.append(item)
+
+    def append(self, item):
+        token = self._next
+        self._next += 1
+        self._items[token] = item
+        self._typed[item.type][token] = item
+        self._tokens.setdefault(id(item), []).append(token)
+        if profiling.active is not None:
+            profiling.active.counters["bucket_insertions"] += 1
+
+    def remove(self, item):
+        """
+        Remove ``item``, raising `ValueError` if absent (as `list` does).
+        """
+        tokens = self._tokens.get(id(item))
+        if not tokens:
+            raise ValueError(f"{item!r} not in bucket")
+        token = tokens.pop(0)
+        del self._items[token]
+        del self._typed[item.type][token]
+        if not tokens:
+            del self._tokens[id(item)]
+        if profiling.active is not None:
+            profiling.active.counters["bucket_removals"] += 1
+
+    def discard(self, item):
+        """
+        Remove ``item`` if present; do nothing otherwise.
+        """
+        if item in self:
+            self.remove(item)
+
+    def copy(self):
+        return Bucket(self)
+
+    def grouped(self):
+        """
+        Return a list of members grouped by type, as releases display them.
+
+        Features come first, then bugs, then support items (see
+        `~releases.models.ENTRY_ORDER`), each in insertion order.
+        """
+        return [x for items in self._typed.values() for x in items.values()]
+
+    def __contains__(self, item):
+        return id(item) in self._tokens
+
+    def __iter__(self):
+        return iter(self._items.values())
+
+    def __len__(self):
+        return len(self._items)
+
+    def __getitem__(self, index):
+        return list(self)[index]
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 # TODO: un-subclass dict in favor of something more explicit, once all regular
 # dict-like access has been factored out into methods
 class LineManager(dict):
@@ -5,14 +110,27 @@ class LineManager(dict):
     Manages multiple release lines/families as well as related config state.
     """
 
-    def __init__(self, app):
+    def __init__(self, app, trace=NULL_TRACER):
         """
         Initialize new line manager dict.
 
         :param app: The core Sphinx app object. Mostly used for config.
+        :param trace:
+            A `~releases.trace.Tracer` to report bucket movements to.
         """
         super().__init__()
         self.app = app
+        self.trace = trace
+        # Per-family release lines as sorted (Version, "N.N") pairs, so spec
+        # matching needn't re-derive versions from bucket keys each time; and
+        # spec -> matching lines, valid until a family or line is added.
+        self._lines = {}
+        self._matches = {}
+        # Facts derived from the above, checked for nearly every entry but
+        # only changing along with it; see `_lines_changed`.
+        self._stable_families = []
+        self._released_families = []
+        self._has_stable_releases = False
 
     @property
     def config(self):
@@ -34,8 +152,103 @@ class LineManager(dict):
         # 'unreleased'
         if major_number == 0 and self.config.releases_unstable_prehistory:
             keys = ["unreleased"]
-        # Either way, the buckets default to an empty list
-        self[major_number] = {key: [] for key in keys}
+        # Either way, the buckets start out empty
+        self[major_number] = {key: Bucket() for key in keys}
+        self._lines[major_number] = []
+        self._lines_changed()
+        self.trace.emit("family_added", family=major_number)
+
+    def add_line(self, family, line):
+        """
+        Add an (empty) bucket for release ``line`` (e.g. ``"1.2"``).
+
+        :param int family: The major release family the line belongs to.
+        :param str line: The minor release line, as in `Release.minor`.
+        """
+        self[family][line] = Bucket()
+        insort(self._lines.setdefault(family, []), (parse_version(line), line))
+        self._lines_changed()
+        self.trace.emit("line_added", family=family, bucket=line)
+
+    def _lines_changed(self):
+        """
+        Refresh state derived from the line index, after it's been updated.
+        """
+        self._matches.clear()
+        self._stable_families = [x for x in self._lines if x != 0]
+        self._released_families = [x for x, y in self._lines.items() if y]
+        nonzeroes = self._stable_families
+        # Nothing but 0.x releases -> yup we're prehistory
+        if not nonzeroes:
+            self._has_stable_releases = False
+        # Presumably, if there's >1 major family besides 0.x, we're at least
+        # one release into the 1.0 (or w/e) line.
+        elif len(nonzeroes) > 1:
+            self._has_stable_releases = True
+        # If there's only one, we may still be in the space before its N.0.0
+        # as well; we can check by testing for existence of bugfix buckets
+        else:
+            self._has_stable_releases = bool(self._lines[nonzeroes[0]])
+
+    def lines(self, family):
+        """
+        Return ``family``'s release lines (e.g. ``["1.0", "1.1"]``), sorted.
+        """
+        return [line for _, line in self._lines.get(family, ())]
+
+    def matching_lines(self, spec):
+        """
+        Return ``(family, lines)`` pairs for families matching ``spec``.
+
+        ``lines`` are the family's release lines which also match ``spec``,
+        in ascending order. Results are memoized per spec until the next
+        `add_family` or `add_line` call.
+        """
+        try:
+            return self._matches[spec]
+        except KeyError:
+            pass
+        result = []
+        for family, lines in self._lines.items():
+            if not spec.match(parse_version(str(family))):
+                continue
+            result.append(
+                (
+                    family,
+                    [line for version, line in lines if spec.match(version)],
+                )
+            )
+        profiling.count("spec_filters")
+        self._matches[spec] = result
+        return result
+
+    def snapshot(self):
+        """
+        Return a plain-dict copy of all families & buckets, sans app/config.
+
+        Suitable for pickling; see `restore` for the inverse.
+        """
+        return {
+            family: {key: list(bucket) for key, bucket in lines.items()}
+            for family, lines in self.items()
+        }
+
+    def restore(self, snapshot):
+        """
+        Replace all families & buckets with those from a `snapshot`.
+        """
+        self.clear()
+        self._lines.clear()
+        for family, lines in snapshot.items():
+            self[family] = {
+                key: Bucket(bucket) for key, bucket in lines.items()
+            }
+            self._lines[family] = sorted(
+                (parse_version(key), key)
+                for key in lines
+                if not key.startswith("unreleased")
+            )
+        self._lines_changed()
 
     @property
     def unstable_prehistory(self):
@@ -53,24 +266,23 @@ class LineManager(dict):
     def stable_families(self):
         """
         Returns release family numbers which aren't 0 (i.e. prehistory).
+
+        This is kept up to date as families are added; don't modify it.
+        """
+        return self._stable_families
+
+    @property
+    def released_families(self):
+        """
+        Returns family numbers which have at least one release line so far.
+
+        As with `stable_families`, this is shared state; don't modify it.
         """
-        return [x for x in self if x != 0]
+        return self._released_families
 
     @property
     def has_stable_releases(self):
         """
         Returns whether stable (post-0.x) releases seem to exist.
         """
-        nonzeroes = self.stable_families
-        # Nothing but 0.x releases -> yup we're prehistory
-        if not nonzeroes:
-            return False
-        # Presumably, if there's >1 major family besides 0.x, we're at least
-        # one release into the 1.0 (or w/e) line.
-        if len(nonzeroes) > 1:
-            return True
-        # If there's only one, we may still be in the space before its N.0.0 as
-        # well; we can check by testing for existence of bugfix buckets
-        return any(
-            x for x in self[nonzeroes[0]] if not x.startswith("unreleased")
-        )
+        return self._has_stable_releases
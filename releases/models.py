@@ -1,5 +1,4 @@
-from functools import reduce
-from operator import xor
+from functools import lru_cache
 
 from docutils import nodes
 from semantic_version import Version as StrictVersion, Spec
@@ -14,53 +13,237 @@ class Version(StrictVersion):
         super().__init__(version_string, partial)
 
 
+#: Upper bound on how many distinct version/spec strings stay memoized.
+PARSE_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_version(version_string):
+    """
+    Return a `Version` for ``version_string``, memoized & shared across calls.
+
+    Versions are never mutated after parsing, so handing out the same object
+    to every caller is safe.
+    """
+    return Version(version_string)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_spec(spec_string):
+    """
+    Return a ``Spec`` for ``spec_string``, memoized & shared across calls.
+
+    An empty string yields the empty (match-everything) ``Spec``. As with
+    ``Spec`` itself, raises `ValueError` if the string is invalid (such
+    failures are not cached).
+    """
+    return Spec(spec_string) if spec_string else Spec()
+
+
 # Issue type list (keys) + color values
 ISSUE_TYPES = {"bug": "A04040", "feature": "40A056", "support": "4070A0"}
 
+#: Order in which each issue type's entries are listed within a release.
+ENTRY_ORDER = ("feature", "bug", "support")
+
+
+def issue_key(type_, number, backported=False, major=False):
+    """
+    Return the identity key an issue with the given details would have.
+
+    Handy for looking up issues in indexes keyed by `Issue.key`.
+    """
+    return (type_, number, backported, major)
+
+
+class IssueRecord:
+    """
+    Compact classification data for an `Issue`, computed once at creation.
+
+    The release-organizing logic consults these flags over and over; reading
+    them off a slotted record avoids going through the docutils attribute
+    dict (and recomputing derived flags like ``is_featurelike``) every time.
+    """
+
+    __slots__ = (
+        "type",
+        "number",
+        "backported",
+        "major",
+        "spec",
+        "is_featurelike",
+        "key",
+    )
+
+    def __init__(
+        self, type_, number=None, backported=False, major=False, spec=None
+    ):
+        self.type = type_
+        self.number = number
+        self.backported = backported
+        self.major = major
+        self.spec = spec
+        if type_ == "bug":
+            self.is_featurelike = major
+        else:
+            self.is_featurelike = not backported
+        self.key = issue_key(type_, number, backported, major)
 
-class Issue(nodes.Element):
-    # Technically, we just need number, but heck, you never know...
-    _cmp_keys = ("type", "number", "backported", "major")
+    @classmethod
+    def from_attributes(cls, attributes):
+        """
+        Build a record from `Issue`-style node ``attributes``.
+        """
+        return cls(
+            type_=attributes.get("type_", None),
+            number=attributes.get("number", None),
+            backported=attributes.get("backported", False),
+            major=attributes.get("major", False),
+            spec=attributes.get("spec", None),
+        )
+
+
+class RecordElement(nodes.Element):
+    """
+    Element keeping some of its attributes in a slotted ``self.record``.
+
+    Those attributes (named by ``record_fields``, which maps them to record
+    slots) are stored only there, not in the docutils attribute dict, so the
+    two can't disagree. Dict-style access like ``node["number"]``,
+    ``node.get("number")`` or ``"number" in node`` still works for them;
+    assigning one gives the node a fresh record, as records themselves are
+    never mutated (copies of a node share its record).
+
+    Subclasses define ``make_record(fields)``, a classmethod returning a
+    record for the given ``record_fields`` values.
+    """
+
+    #: Attribute names to their record slot names.
+    record_fields = {}
+
+    def __init__(self, rawsource="", *children, **attributes):
+        fields = {
+            key: attributes.pop(key)
+            for key in self.record_fields
+            if key in attributes
+        }
+        super().__init__(rawsource, *children, **attributes)
+        self.record = self.make_record(fields)
+
+    def record_attributes(self):
+        """
+        Return this node's ``record_fields`` values, keyed by attribute name.
+        """
+        return {
+            key: getattr(self.record, slot)
+            for key, slot in self.record_fields.items()
+        }
+
+    def copy(self):
+        # Sphinx swaps in a copy() which skips __init__; records are never
+        # mutated, so copies can simply share ours.
+        obj = super().copy()
+        obj.record = self.record
+        return obj
+
+    def __getitem__(self, key):
+        if isinstance(key, str) and key in self.record_fields:
+            return getattr(self.record, self.record_fields[key])
+        return super().__getitem__(key)
+
+    def __setitem__(self, key, item):
+        if isinstance(key, str) and key in self.record_fields:
+            fields = self.record_attributes()
+            fields[key] = item
+            self.record = self.make_record(fields)
+        else:
+            super().__setitem__(key, item)
+
+    def get(self, key, failobj=None):
+        if key in self.record_fields:
+            return self[key]
+        return super().get(key, failobj)
+
+    def __contains__(self, key):
+        if isinstance(key, str) and key in self.record_fields:
+            return True
+        return super().__contains__(key)
+
+    def hasattr(self, attr):
+        return attr in self.record_fields or super().hasattr(attr)
+
+    def non_default_attributes(self):
+        # So pformat() etc still show the record's data.
+        atts = super().non_default_attributes()
+        atts.update(self.record_attributes())
+        return atts
+
+
+class Issue(RecordElement):
+    """
+    Changelog issue node, as created by `releases.issues_role`.
+
+    Classification (type, number, flags & spec) is fixed when the node is
+    created and kept in an `IssueRecord` at ``self.record``; the docutils side
+    (``nodelist``, ``description``) is only needed again when rendering.
+    """
+
+    record_fields = {
+        "type_": "type",
+        "number": "number",
+        "backported": "backported",
+        "major": "major",
+        "spec": "spec",
+    }
+
+    @classmethod
+    def make_record(cls, fields):
+        return IssueRecord.from_attributes(fields)
 
     @property
     def type(self):
-        return self["type_"]
+        return self.record.type
 
     @property
     def is_featurelike(self):
-        if self.type == "bug":
-            return self.major
-        else:
-            return not self.backported
+        return self.record.is_featurelike
 
     @property
     def is_buglike(self):
-        return not self.is_featurelike
+        return not self.record.is_featurelike
 
     @property
     def backported(self):
-        return self.get("backported", False)
+        return self.record.backported
 
     @property
     def major(self):
-        return self.get("major", False)
+        return self.record.major
 
     @property
     def number(self):
-        return self.get("number", None)
+        return self.record.number
 
     @property
     def spec(self):
-        return self.get("spec", None)
+        return self.record.spec
+
+    @property
+    def key(self):
+        """
+        Identity tuple of type, number, backported & major; see `issue_key`.
+
+        Issues compare (and hash) equal when their keys do.
+        """
+        return self.record.key
 
     def __eq__(self, other):
-        for attr in self._cmp_keys:
-            if getattr(self, attr, None) != getattr(other, attr, None):
-                return False
-        return True
+        if not isinstance(other, Issue):
+            return NotImplemented
+        return self.record.key == other.record.key
 
     def __hash__(self):
-        return reduce(xor, [hash(getattr(self, x)) for x in self._cmp_keys])
+        return hash(self.record.key)
 
     def minor_releases(self, manager):
         """
@@ -70,11 +253,7 @@ class Issue(nodes.Element):
         # very similar test for "do you have any actual releases yet?"
         # elsewhere. (This may be fodder for changing how we roll up
         # pre-major-release features though...?)
-        return [
-            key
-            for key, value in manager.items()
-            if any(x for x in value if not x.startswith("unreleased"))
-        ]
+        return manager.released_families
 
     def default_spec(self, manager):
         """
@@ -119,7 +298,7 @@ class Issue(nodes.Element):
             buckets = self.minor_releases(manager)
             if buckets:
                 specstr = ">={}".format(max(buckets))
-        return Spec(specstr) if specstr else Spec()
+        return parse_spec(specstr)
 
     def add_to_manager(self, manager):
         """
@@ -129,21 +308,18 @@ class Issue(nodes.Element):
         spec = self.spec or self.default_spec(manager)
         # Only look in appropriate major version/family; if self is an issue
         # declared as living in e.g. >=2, this means we don't even bother
-        # looking in the 1.x family.
-        families = [Version(str(x)) for x in manager]
-        versions = list(spec.filter(families))
-        for version in versions:
-            family = version.major
-            # Within each family, we further limit which bugfix lines match up
-            # to what self cares about (ignoring 'unreleased' until later)
-            candidates = [
-                Version(x)
-                for x in manager[family]
-                if not x.startswith("unreleased")
-            ]
-            # Select matching release lines (& stringify)
+        # looking in the 1.x family. Within each family, we further limit
+        # which bugfix lines match up to what self cares about (ignoring
+        # 'unreleased' until later). The manager memoizes this per spec.
+        matches = manager.matching_lines(spec)
+        # Obtain list of minor releases to check for "haven't had ANY
+        # releases yet" corner case, in which case ALL issues get thrown in
+        # unreleased_feature for the first release to consume.
+        # NOTE: assumes first release is a minor or major one,
+        # but...really? why would your first release be a bugfix one??
+        no_releases = not self.minor_releases(manager)
+        for family, bugfix_buckets in matches:
             buckets = []
-            bugfix_buckets = [str(x) for x in spec.filter(candidates)]
             # Add back in unreleased_* as appropriate
             # TODO: probably leverage Issue subclasses for this eventually?
             if self.is_buglike:
@@ -153,18 +329,15 @@ class Issue(nodes.Element):
                 # and only exists for features to go into.
                 if bugfix_buckets:
                     buckets.append("unreleased_bugfix")
-            # Obtain list of minor releases to check for "haven't had ANY
-            # releases yet" corner case, in which case ALL issues get thrown in
-            # unreleased_feature for the first release to consume.
-            # NOTE: assumes first release is a minor or major one,
-            # but...really? why would your first release be a bugfix one??
-            no_releases = not self.minor_releases(manager)
             if self.is_featurelike or self.backported or no_releases:
                 buckets.append("unreleased_feature")
             # Now that we know which buckets are appropriate, add ourself to
             # all of them. TODO: or just...do it above...instead...
             for bucket in buckets:
                 manager[family][bucket].append(self)
+                manager.trace.emit(
+                    "issue_added", issue=self, family=family, bucket=bucket
+                )
 
     def __repr__(self):
         flag = ""
@@ -181,21 +354,71 @@ class Issue(nodes.Element):
         )
 
 
-class Release(nodes.Element):
+class ReleaseVersionInfo:
+    """
+    Compact version data for a `Release`, computed once at creation.
+
+    Pseudo-releases (e.g. unreleased buckets) have non-version numbers; their
+    ``version``, ``minor`` and ``family`` are ``None``.
+    """
+
+    __slots__ = ("number", "version", "minor", "family")
+
+    def __init__(self, number, version=None):
+        self.number = number
+        if version is None and number is not None:
+            try:
+                version = parse_version(number)
+            except ValueError:
+                pass
+        self.version = version
+        self.minor = self.family = None
+        if version is not None:
+            self.minor = f"{version.major}.{version.minor}"
+            self.family = version.major
+
+
+class Release(RecordElement):
+    """
+    Changelog release node, as created by `releases.release_role`.
+
+    Version details are parsed once, into a `ReleaseVersionInfo` at
+    ``self.record``.
+    """
+
+    record_fields = {"number": "number", "version": "version"}
+
+    @classmethod
+    def make_record(cls, fields):
+        return ReleaseVersionInfo(
+            fields.get("number", None), fields.get("version", None)
+        )
+
     @property
     def number(self):
-        return self["number"]
+        return self.record.number
+
+    @property
+    def version(self):
+        """
+        Parsed `Version` of this release's number.
+
+        Normally obtained once, at role time; raises `ValueError` for
+        pseudo-releases whose number isn't a version.
+        """
+        version = self.record.version
+        if version is None:
+            version = parse_version(self.number)
+        return version
 
     @property
     def minor(self):
-        # TODO: use Version
-        return ".".join(self.number.split(".")[:-1])
+        return self.record.minor
 
     @property
     def family(self):
-        # TODO: use Version.major
-        # TODO: and probs just rename to .major, 'family' is dumb tbh
-        return int(self.number.split(".")[0])
+        # TODO: probs just rename to .major, 'family' is dumb tbh
+        return self.record.family
 
     def __repr__(self):
         return "<release {}>".format(self.number)
@@ -0,0 +1,145 @@
+"""
+Opt-in timing & operation-counting instrumentation.
+
+Enabled during Sphinx builds via the ``releases_profile`` setting, or around
+arbitrary code (e.g. `releases.util.parse_changelog` calls) via `profiled`.
+When no profile is active, instrumented code only pays for a ``None`` check.
+"""
+
+import json
+import os
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from functools import wraps
+
+
+#: The currently recording `Profile`, if any.
+active = None
+
+#: Filename of the report written into the build output directory.
+REPORT_FILENAME = "releases-profile.json"
+
+
+class Profile:
+    """
+    Accumulated wall time per phase, plus counts of interesting operations.
+    """
+
+    def __init__(self):
+        self.timings = defaultdict(float)
+        self.calls = Counter()
+        self.counters = Counter()
+
+    def add_time(self, phase, seconds):
+        self.timings[phase] += seconds
+        self.calls[phase] += 1
+
+    def report(self):
+        """
+        Return a JSON-friendly dict of everything recorded so far.
+
+        Phase timings are inclusive: e.g. ``changelog_traversal`` includes
+        the ``construct_releases`` & ``construct_nodes`` work it triggers.
+        """
+        return {
+            "phases": {
+                name: {"seconds": seconds, "calls": self.calls[name]}
+                for name, seconds in self.timings.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+
+def count(name, amount=1):
+    """
+    Bump counter ``name`` on the active profile, if there is one.
+    """
+    if active is not None:
+        active.counters[name] += amount
+
+
+def timed(phase):
+    """
+    Decorator recording wrapped function's wall time under ``phase``.
+    """
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            profile = active
+            if profile is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                profile.add_time(phase, time.perf_counter() - start)
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def phase(name):
+    """
+    Context manager version of `timed`, for blocks rather than functions.
+    """
+    profile = active
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add_time(name, time.perf_counter() - start)
+
+
+@contextmanager
+def profiled():
+    """
+    Record a new `Profile` for the duration of the ``with`` block.
+
+    Yields the profile; call its `~Profile.report` afterwards.
+    """
+    global active
+    previous, active = active, Profile()
+    try:
+        yield active
+    finally:
+        active = previous
+
+
+def start_build_profile(app):
+    """
+    Begin profiling a build, if ``releases_profile`` is set.
+
+    Connected to ``builder-inited``.
+    """
+    global active
+    if app.config.releases_profile:
+        active = Profile()
+
+
+def finish_build_profile(app, exception):
+    """
+    Emit the build's profile report, if one was being recorded.
+
+    Connected to ``build-finished``. The report goes to the callable given
+    as ``releases_profile``, if it is one; otherwise it's written as JSON to
+    `REPORT_FILENAME` in the build output directory.
+    """
+    global active
+    profile, active = active, None
+    if profile is None or exception is not None:
+        return
+    report = profile.report()
+    setting = app.config.releases_profile
+    if callable(setting):
+        setting(report)
+        return
+    path = os.path.join(str(app.outdir), REPORT_FILENAME)
+    with open(path, "w") as fd:
+        json.dump(report, fd, indent=2)
@@ -0,0 +1,127 @@
+"""
+Reverse-lookup index over organized changelogs.
+"""
+
+from collections import defaultdict
+
+
+def _key(number):
+    # Allow 123, "123" or "#123"
+    return str(number).lstrip("#")
+
+
+class ChangelogIndex:
+    """
+    Lookup tables over `releases.construct_releases` output.
+
+    Built in a single pass over the releases and line manager, after which
+    each query is a dict lookup instead of a scan over every release::
+
+        index = parse_changelog("docs/changelog.rst", index=True)
+        index.releases_containing(1234)  # -> ["2.3.1", "2.4.0"]
+        index.pending("2.3")  # -> unreleased bugfixes for 2.3.x
+        index.pending("2.x")  # -> unreleased features for the 2.x family
+
+    Lines are named as in `parse_changelog`'s per-line buckets (e.g.
+    ``"2.3"``), plus ``"N.x"`` for a major family's unreleased features.
+
+    :param list releases: As returned by `releases.construct_releases`.
+    :param manager: The `releases.line_manager.LineManager` returned with it.
+
+    .. versionadded:: 2.2
+    """
+
+    def __init__(self, releases, manager):
+        #: The classic `parse_changelog` dict, when built via that function.
+        self.changelog = None
+        self._releases = {}
+        self._issues = defaultdict(list)
+        self._containing = defaultdict(list)
+        self._released = defaultdict(list)
+        self._pending = {}
+        self._pending_lines = defaultdict(list)
+        seen = set()
+        for release in releases:
+            obj = release["obj"]
+            # Skip unreleased pseudo-releases; the buckets cover those.
+            if obj.minor is None:
+                continue
+            self._releases[obj.number] = release["entries"]
+            for issue in release["entries"]:
+                self._remember(issue, seen)
+                containing = self._containing[issue.number]
+                if not containing or containing[-1] != obj.number:
+                    containing.append(obj.number)
+                self._released[obj.minor].append(issue)
+        # Releases were given oldest first; queries answer newest first.
+        for containing in self._containing.values():
+            containing.reverse()
+        for family, lines in manager.items():
+            for key, bucket in lines.items():
+                # Everything in here is also in its per-line buckets
+                if key == "unreleased_bugfix":
+                    continue
+                line = f"{family}.x" if key.startswith("unreleased") else key
+                self._pending[line] = list(bucket)
+                for issue in bucket:
+                    self._remember(issue, seen)
+                    self._pending_lines[issue.number].append(line)
+
+    def _remember(self, issue, seen):
+        if id(issue) not in seen:
+            seen.add(id(issue))
+            self._issues[issue.number].append(issue)
+
+    @property
+    def release_numbers(self):
+        """
+        All (real) release numbers, oldest first.
+        """
+        return list(self._releases)
+
+    @property
+    def lines(self):
+        """
+        All release lines with released or pending entries.
+        """
+        return sorted(set(self._released) | set(self._pending))
+
+    def release(self, number):
+        """
+        Return the issues in release ``number``; raises `KeyError` if none.
+        """
+        return self._releases[number]
+
+    def issues(self, number):
+        """
+        Return the `~releases.models.Issue` objects numbered ``number``.
+
+        Usually just one, but changelogs may list an issue number repeatedly.
+        """
+        return self._issues.get(_key(number), [])
+
+    def releases_containing(self, number):
+        """
+        Return numbers of releases containing issue ``number``, newest first.
+        """
+        return self._containing.get(_key(number), [])
+
+    def lines_containing(self, number):
+        """
+        Return the lines on which issue ``number`` is still unreleased.
+        """
+        return self._pending_lines.get(_key(number), [])
+
+    def released(self, line):
+        """
+        Return issues released so far on ``line``, in release order.
+
+        An issue appears once per release it was part of.
+        """
+        return self._released.get(line, [])
+
+    def pending(self, line):
+        """
+        Return the unreleased issues for ``line``.
+        """
+        return self._pending.get(line, [])
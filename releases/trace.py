@@ -0,0 +1,99 @@
+"""
+Structured trace of how changelog entries move between buckets & releases.
+
+Enabled via the ``releases_debug`` setting; events are written as NDJSON (one
+JSON object per line), so they're easy to filter, e.g. to find out why a given
+issue ended up in a given release::
+
+    sphinx-build ... 2>&1 >/dev/null | jq -c 'select(.issue.number == "123")'
+
+Call sites hand over raw objects; all formatting happens in `Tracer.emit`,
+and only when tracing is enabled.
+"""
+
+import json
+import sys
+
+from docutils import nodes
+
+from .models import Issue, Release
+
+
+#: How many events to buffer before writing them out.
+BUFFER_SIZE = 1000
+
+
+def _describe(value):
+    """
+    ``json.dumps`` fallback turning our objects into JSON-friendly values.
+    """
+    if isinstance(value, Issue):
+        return {"type": value.type, "number": value.number}
+    if isinstance(value, Release):
+        return value.number
+    if isinstance(value, nodes.Node):
+        return value.astext()
+    # E.g. buckets
+    try:
+        return list(value)
+    except TypeError:
+        return str(value)
+
+
+class NullTracer:
+    """
+    Tracer which discards everything; what's used when tracing is disabled.
+    """
+
+    def __bool__(self):
+        return False
+
+    def emit(self, event, **fields):
+        pass
+
+    def flush(self):
+        pass
+
+
+#: Shared, stateless no-op tracer.
+NULL_TRACER = NullTracer()
+
+
+class Tracer:
+    """
+    Buffered writer of NDJSON trace events to a text stream.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.buffer = []
+
+    def emit(self, event, **fields):
+        """
+        Record an ``event`` (a short name like ``issue_added``) with details.
+        """
+        self.buffer.append(
+            json.dumps({"event": event, **fields}, default=_describe)
+        )
+        if len(self.buffer) >= BUFFER_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Write out any buffered events.
+        """
+        if self.buffer:
+            self.stream.write("\n".join(self.buffer) + "\n")
+            self.buffer = []
+            self.stream.flush()
+
+
+def tracer_for(config):
+    """
+    Return a `Tracer` writing to stderr if ``releases_debug`` is on.
+
+    Otherwise, returns `NULL_TRACER`.
+    """
+    if config.releases_debug:
+        return Tracer(sys.stderr)
+    return NULL_TRACER
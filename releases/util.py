@@ -4,16 +4,24 @@ Utility functions, such as helpers for standalone changelog parsing.
 
 import logging
 import os
+import pickle
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from tempfile import mkdtemp
+from types import SimpleNamespace
 
+from docutils.core import publish_doctree
 from docutils.nodes import bullet_list
+from docutils.parsers.rst import roles
 from sphinx.application import Sphinx  # not exposed at top level
 
 from . import construct_releases, setup
+from .checkpoints import dumps
+from .query import ChangelogIndex
 
 
-def parse_changelog(path, **kwargs):
+def parse_changelog(path, sphinx=True, index=False, **kwargs):
     """
     Load and parse changelog file from ``path``, returning data structures.
 
@@ -34,6 +42,19 @@ def parse_changelog(path, **kwargs):
 
     :param str path: A relative or absolute file path string.
 
+    :param bool sphinx:
+        Whether to parse via a full (if throwaway) Sphinx application, as
+        opposed to plain docutils (see `get_docutils_doctree`). The latter
+        starts up far faster, and yields the same releases and issues, but
+        Sphinx-specific markup within entry descriptions (e.g. ``:doc:``
+        roles) is left unresolved. Default: ``True``.
+
+    :param bool index:
+        Whether to return a `~releases.query.ChangelogIndex` instead, which
+        answers "which releases contain issue N?" and similar questions
+        without scanning every release; the usual dict is then available as
+        its ``changelog`` attribute. Default: ``False``.
+
     :returns:
         A dict whose keys map to lists of ``releases.models.Issue`` objects, as
         follows:
@@ -50,18 +71,161 @@ def parse_changelog(path, **kwargs):
 
     .. versionchanged:: 1.6
         Added support for passing kwargs to `get_doctree`/`make_app`.
+    .. versionchanged:: 2.2
+        Added the ``sphinx`` and ``index`` kwargs.
     """
-    app, doctree = get_doctree(path, **kwargs)
+    if sphinx:
+        app, doctree = get_doctree(path, **kwargs)
+    else:
+        app, doctree = get_docutils_doctree(path, **kwargs)
+    return _changelog_from_doctree(app, doctree, index=index)
+
+
+def _first_bullet_list(doctree):
     # Have to semi-reproduce the 'find first bullet list' bit from main code,
     # which is unfortunately side-effect-heavy (thanks to Sphinx plugin
     # design).
-    first_list = None
     for node in doctree[0]:
         if isinstance(node, bullet_list):
-            first_list = node
-            break
+            return node
+
+
+#: Lightweight per-release record yielded by `iter_releases`.
+ReleaseRecord = namedtuple("ReleaseRecord", ["number", "date", "entries"])
+
+
+def iter_releases(
+    path, cache_dir=None, unreleased=False, sphinx=True, **kwargs
+):
+    """
+    Yield the releases in the changelog at ``path``, newest first.
+
+    Meant for tools asking questions like "what's the latest release?",
+    which can simply stop iterating once they have their answer::
+
+        latest = next(iter_releases("/path/to/changelog.rst"))
+        print(latest.number, [x.number for x in latest.entries])
+
+    Unlike `parse_changelog`, no dict of every release & bucket is built.
+    However, the contents of even the newest release depend on the entire
+    history below it, so that history is always organized (though never
+    rendered) before the first item is yielded. Give ``cache_dir`` to make
+    that cheap on subsequent calls: parsing state is then checkpointed there
+    (as with the ``releases_checkpoints`` setting), and later calls only
+    replay entries above the newest unchanged release.
+
+    :param str path: A relative or absolute file path string.
+
+    :param str cache_dir:
+        Directory to store (& look for) parsing checkpoints in. Default:
+        ``None`` (no checkpointing).
+
+    :param bool unreleased:
+        Whether to also yield the "Next (bugfix|feature) release" pseudo
+        releases, whose numbers look like ``unreleased_1.x_bugfix`` and whose
+        dates are ``None``; these come first when present. Default: ``False``.
+
+    :param bool sphinx: As with `parse_changelog`.
+
+    Any additional kwargs are handled as in `parse_changelog`.
+
+    :returns: A generator of `ReleaseRecord` (number, date, entries) tuples.
+
+    .. versionadded:: 2.2
+    """
+    if cache_dir is not None:
+        kwargs.update(checkpoints=True, doctreedir=cache_dir)
+    if sphinx:
+        app, doctree = get_doctree(path, **kwargs)
+    else:
+        app, doctree = get_docutils_doctree(path, **kwargs)
+    first_list = _first_bullet_list(doctree)
+    releases, _ = construct_releases(first_list.children, app)
+    for release in reversed(releases):
+        obj = release["obj"]
+        if obj["date"] is None and not unreleased:
+            continue
+        yield ReleaseRecord(obj.number, obj["date"], release["entries"])
+
+
+def parse_changelogs(paths, workers=None, sphinx=True, **kwargs):
+    """
+    Parse many changelog files at once, spread over a pool of processes.
+
+    Parsing is CPU-bound pure Python, so this uses worker processes (each of
+    which sets up a single `ChangelogParser` before receiving any work), not
+    threads.
+
+    :param paths: An iterable of relative or absolute file path strings.
+
+    :param int workers:
+        Number of worker processes; defaults to the number of CPUs. Given
+        ``1``, everything happens in the current process instead.
+
+    :param bool sphinx: As with `parse_changelog`.
+
+    Any additional kwargs are passed to each worker's `ChangelogParser`.
+
+    :returns:
+        A list with one item per path, in the same order as ``paths``. Each
+        item is either the dict `parse_changelog` would have returned, or -
+        if parsing that file failed - the exception that was raised; one bad
+        file does not abort the batch.
+
+    .. versionadded:: 2.2
+    """
+    paths = list(paths)
+    if workers == 1:
+        parser = ChangelogParser(sphinx=sphinx, **kwargs)
+        return [_parse_or_error(parser, path) for path in paths]
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(sphinx, kwargs),
+    ) as pool:
+        results = list(pool.map(_parse_in_worker, paths))
+    return [pickle.loads(x) if isinstance(x, bytes) else x for x in results]
+
+
+# Each parse_changelogs() worker process's own ChangelogParser.
+_worker_parser = None
+
+
+def _init_worker(sphinx, kwargs):
+    global _worker_parser
+    _worker_parser = ChangelogParser(sphinx=sphinx, **kwargs)
+
+
+def _parse_or_error(parser, path):
+    try:
+        return parser.parse(path)
+    except Exception as e:
+        return e
+
+
+def _parse_in_worker(path):
+    result = _parse_or_error(_worker_parser, path)
+    # Issues reference their original doctree, so ship results back detached
+    # from it (& pre-pickled).
+    if not isinstance(result, Exception):
+        return dumps(result)
+    # Exceptions that can't make the trip back get boiled down to a message.
+    try:
+        pickle.dumps(result)
+    except Exception:
+        result = RuntimeError(f"{type(result).__name__}: {result}")
+    return result
+
+
+def _changelog_from_doctree(app, doctree, index=False):
+    """
+    Organize the changelog found in ``doctree``, as per `parse_changelog`.
+    """
     # Initial parse into the structures Releases finds useful internally
+    first_list = _first_bullet_list(doctree)
     releases, manager = construct_releases(first_list.children, app)
+    # Index before the manager gets flattened (& mutated) below
+    lookup = ChangelogIndex(releases, manager) if index else None
     ret = changelog2dict(releases)
     # Stitch them together into something an end-user would find better:
     # - nuke unreleased_N.N_Y as their contents will be represented in the
@@ -77,11 +241,16 @@ def parse_changelog(path, **kwargs):
         # unreleased_N_feature
         unreleased = manager[family].pop("unreleased_feature", None)
         if unreleased is not None:
-            ret["unreleased_{}_feature".format(family)] = unreleased
+            ret["unreleased_{}_feature".format(family)] = list(unreleased)
         # - bring over all per-line buckets from manager (flattening)
         # Here, all that's left in the per-family bucket should be lines, not
-        # unreleased_*
-        ret.update(manager[family])
+        # unreleased_*. (Plain lists, not our internal Bucket objects.)
+        ret.update(
+            (line, list(bucket)) for line, bucket in manager[family].items()
+        )
+    if lookup is not None:
+        lookup.changelog = ret
+        return lookup
     return ret
 
 
@@ -119,13 +288,150 @@ def get_doctree(path, **kwargs):
     # their dirname is the project/doc root)
     # NOTE: using absolute to avoid docutils bugs
     app = make_app(srcdir=path.parent.absolute(), **kwargs)
+    return app, _read_doctree(app, path)
+
+
+def _read_doctree(app, path):
+    """
+    Have Sphinx ``app`` read & return the doctree for `~pathlib.Path` ``path``.
+    """
     app.env.temp_data["docname"] = path.stem
     # NOTE: prior to v7, sphinx.io.read_doc was used and just returned the
     # generated document. its alternative tries literally writing to disk, so
     # we neuter that part via a nasty monkeypatch in order to obtain the value
     app.builder.__class__.write_doctree = _faux_write_doctree
     app.builder.read_doc(str(path.absolute().with_suffix("")))
-    return app, app.builder._read_doctree
+    return app.builder._read_doctree
+
+
+class DocutilsApp:
+    """
+    Minimal stand-in for a Sphinx app, for parsing changelogs via docutils.
+
+    Provides just enough of the Sphinx application API (``config``, ``env``,
+    ``add_config_value``, ``add_role``, ``connect``) for our own `setup` and
+    parsing code to run against it; roles get registered straight with
+    docutils.
+
+    Keyword arguments become ``releases_xxx`` config settings, exactly as with
+    `make_app`, save for ``doctreedir``, which the ``checkpoints`` and
+    ``cache`` settings require (there's no default to fall back on).
+
+    .. versionadded:: 2.2
+    """
+
+    def __init__(self, **kwargs):
+        self.config = SimpleNamespace(values={})
+        # Roles find the config via document.settings.env.app.config
+        self.env = SimpleNamespace(app=self, temp_data={})
+        # No build dirs to speak of, except maybe one for checkpoints
+        self.srcdir = self.outdir = None
+        self.doctreedir = kwargs.pop("doctreedir", None)
+        setup(self)
+        for name, value in _app_config(kwargs).items():
+            setattr(self.config, name, value)
+
+    def add_config_value(self, name, default, rebuild, types=()):
+        self.config.values[name] = default
+        setattr(self.config, name, default)
+
+    def add_role(self, name, role):
+        roles.register_local_role(name, role)
+
+    def connect(self, event, callback):
+        # No Sphinx events happen outside of Sphinx.
+        pass
+
+
+def get_docutils_doctree(path, **kwargs):
+    """
+    Obtain a doctree for the RST file at ``path`` using only docutils.
+
+    Like `get_doctree`, but without spinning up a Sphinx application (nor
+    its temp directories), so it's much cheaper. The tradeoff is that
+    Sphinx-only roles & directives within the file are not understood; they
+    are left in the doctree as (quietly) problematic nodes.
+
+    Any additional kwargs are passed unmodified into `DocutilsApp`.
+
+    :returns:
+        A two-tuple of the `DocutilsApp` and the doctree (a
+        ``docutils.document`` object), structured as Sphinx would have.
+
+    .. versionadded:: 2.2
+    """
+    path = Path(path)
+    app = DocutilsApp(**kwargs)
+    return app, _publish_doctree(app, path)
+
+
+def _publish_doctree(app, path):
+    """
+    Parse & return the doctree for `~pathlib.Path` ``path`` w/ `DocutilsApp`.
+    """
+    app.env.temp_data["docname"] = path.stem
+    return publish_doctree(
+        path.read_text(encoding="utf-8"),
+        source_path=str(path.absolute()),
+        settings_overrides={
+            "env": app.env,
+            # Sphinx leaves the top section alone instead of promoting its
+            # title into the document's.
+            "doctitle_xform": False,
+            # Don't complain (or die) about Sphinx-only markup.
+            "report_level": 5,
+            "halt_level": 5,
+        },
+    )
+
+
+class ChangelogParser:
+    """
+    Reusable changelog parsing session, set up once for many `parse` calls.
+
+    `parse_changelog` creates (and configures) a brand new app every time
+    it's called, which dominates the cost of parsing any one changelog. When
+    parsing many files, create one of these and call `parse` repeatedly::
+
+        parser = ChangelogParser()
+        for path in paths:
+            print(parser.parse(path)["unreleased_1_feature"])
+
+    Only per-document state is reset between files.
+
+    :param bool sphinx: As with `parse_changelog`.
+
+    Any additional kwargs are passed unmodified into `make_app` (or
+    `DocutilsApp`, when ``sphinx=False``).
+
+    .. versionadded:: 2.2
+    """
+
+    def __init__(self, sphinx=True, **kwargs):
+        self.sphinx = sphinx
+        self.app = make_app(**kwargs) if sphinx else DocutilsApp(**kwargs)
+
+    def get_doctree(self, path):
+        """
+        Return the doctree for ``path``, as with `get_doctree`.
+        """
+        path = Path(path)
+        if not self.sphinx:
+            return _publish_doctree(self.app, path)
+        doctree = _read_doctree(self.app, path)
+        # Don't let the environment accumulate data about every file read.
+        self.app.env.clear_doc(str(path.absolute().with_suffix("")))
+        return doctree
+
+    def parse(self, path, index=False):
+        """
+        Parse the changelog at ``path``, returning a dict of its contents.
+
+        See `parse_changelog` for details on the return value (& ``index``).
+        """
+        return _changelog_from_doctree(
+            self.app, self.get_doctree(path), index=index
+        )
 
 
 def load_conf(srcdir):
@@ -220,24 +526,11 @@ def make_app(**kwargs):
             except OSError:
                 pass
     setup(app)
-    # Mock out the config within. More assumptions by Sphinx :(
-    # TODO: just use real config and overlay what truly needs changing? is that
-    # feasible given the rest of the weird ordering we have to do? If it is,
-    # maybe just literally slap this over the return value of load_conf()...
-    config = {
-        "releases_release_uri": "foo_%s",
-        "releases_issue_uri": "bar_%s",
-        "releases_debug": False,
-        "master_doc": "index",
-    }
     # Allow tinkering with document filename
     if "docname" in kwargs:
         app.env.temp_data["docname"] = kwargs.pop("docname")
-    # Allow config overrides via kwargs
-    for name in kwargs:
-        config["releases_{}".format(name)] = kwargs[name]
     # Stitch together as the sphinx app init() usually does w/ real conf files
-    app.config._raw_config = config
+    app.config._raw_config = _app_config(kwargs)
     app.config.init_values()
     # Initialize extensions (the internal call to this happens at init time,
     # which of course had no valid config yet here...)
@@ -250,6 +543,28 @@ def make_app(**kwargs):
     return app
 
 
+def _app_config(kwargs):
+    """
+    Return the config dict `make_app` (and `DocutilsApp`) overlay onto apps.
+
+    Each of ``kwargs`` becomes a ``releases_<name>`` setting.
+    """
+    # Mock out the config within. More assumptions by Sphinx :(
+    # TODO: just use real config and overlay what truly needs changing? is that
+    # feasible given the rest of the weird ordering we have to do? If it is,
+    # maybe just literally slap this over the return value of load_conf()...
+    config = {
+        "releases_release_uri": "foo_%s",
+        "releases_issue_uri": "bar_%s",
+        "releases_debug": False,
+        "master_doc": "index",
+    }
+    # Allow config overrides via kwargs
+    for name in kwargs:
+        config["releases_{}".format(name)] = kwargs[name]
+    return config
+
+
 def changelog2dict(changelog):
     """
     Helper turning internal list-o-releases structure into a dict.
@@ -23,6 +23,7 @@ setup(
         "CI": "https://app.circleci.com/pipelines/github/bitprophet/releases",
     },
     packages=["releases"],
+    entry_points={"console_scripts": ["releases = releases.cli:main"]},
     install_requires=[
         # We mostly still work on Sphinx>=1.8, but a number of transitive
         # dependencies do not, and trying to square that circle is definitely
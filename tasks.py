@@ -4,10 +4,30 @@ from invocations import docs, checks, ci
 from invocations.pytest import test, integration, coverage
 from invocations.packaging import release
 
-from invoke import Collection
+from invoke import Collection, task
 
 
-ns = Collection(test, integration, coverage, release, docs, ci, checks.blacken)
+@task
+def benchmark(c, releases=500, families=3, repeat=3, output=None):
+    """
+    Time each phase of changelog processing, on a synthetic changelog.
+    """
+    flags = f"--releases {releases} --families {families} --repeat {repeat}"
+    if output:
+        flags += f" --output {output}"
+    c.run(f"python -m benchmarks.run {flags}", pty=True)
+
+
+ns = Collection(
+    test,
+    integration,
+    coverage,
+    release,
+    docs,
+    ci,
+    checks.blacken,
+    benchmark,
+)
 ns.configure(
     {
         "packaging": {
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+
+from docutils.nodes import bullet_list, image, list_item, paragraph
+from pytest import raises
+
+from releases import construct_archived_nodes, construct_releases
+from releases.archive import archive_mode, archive_title, split_releases
+
+from _util import b, f, make_app, release_list
+
+
+def _releases():
+    entries = release_list(
+        b(6), "2.0.1", b(5), "2.0.0", "1.1.1", b(4), "1.1.0", f(3), "1.0.1"
+    )
+    releases, _ = construct_releases(entries, make_app())
+    return releases
+
+
+def _numbers(page):
+    return [x["obj"].number for x in page[1]]
+
+
+def _mode(setting):
+    return archive_mode(SimpleNamespace(releases_archive=setting))
+
+
+class archive_mode_:
+    def is_off_by_default(self):
+        assert archive_mode(make_app().config) is None
+
+    def true_means_family(self):
+        assert _mode(True) == "family"
+        assert _mode("family") == "family"
+
+    def accepts_release_counts(self):
+        assert _mode(50) == 50
+        assert _mode("50") == 50
+
+    def zero_means_off(self):
+        assert _mode(0) is None
+        assert _mode("0") is None
+        assert _mode(False) is None
+
+    def rejects_anything_else(self):
+        for setting in (-1, "yearly"):
+            with raises(ValueError):
+                _mode(setting)
+
+
+class split_releases_:
+    def chunks_older_releases_newest_first(self):
+        pages = split_releases(_releases(), 2)
+        assert [x[0] for x in pages] == [None, "1", "2"]
+        # Main page keeps unreleased pseudo-releases, newest last as ever
+        assert _numbers(pages[0]) == [
+            "2.0.0",
+            "2.0.1",
+            "unreleased_1.x_bugfix",
+            "unreleased_1.x_feature",
+            "unreleased_2.x_bugfix",
+            "unreleased_2.x_feature",
+        ]
+        assert _numbers(pages[1]) == ["1.1.0", "1.1.1"]
+        assert _numbers(pages[2]) == ["1.0.0", "1.0.1"]
+
+    def splits_by_family(self):
+        pages = split_releases(_releases(), "family")
+        assert [x[0] for x in pages] == [None, "1.x"]
+        assert _numbers(pages[1]) == ["1.0.0", "1.0.1", "1.1.0", "1.1.1"]
+
+    def everything_fits_on_main_page(self):
+        releases = _releases()
+        assert split_releases(releases, 100) == [(None, releases)]
+
+    def entries_unaffected(self):
+        pages = split_releases(_releases(), 2)
+        assert [x.number for x in pages[0][1][1]["entries"]] == ["5"]
+
+
+class archive_title_:
+    def describes_pages(self):
+        releases = _releases()
+        assert archive_title("1.x", releases[:4]) == "1.x releases"
+        assert archive_title("1", releases[:2]) == "Releases 1.0.0 to 1.0.1"
+        assert archive_title("1", releases[:1]) == "Release 1.0.0"
+
+
+class construct_archived_nodes_:
+    def pages_agree_on_prerendering(self):
+        app = make_app()
+        # Bug 5 (with an image, so no prerendering) is only on the main page,
+        # while bug 2 is on both it & the 1.0.2 archive page
+        pic = list_item(
+            "", paragraph("", "", b(5, spec="1.1+"), image(uri="x.png"))
+        )
+        entries = release_list("1.1.1", "1.0.2", pic, b(2), "1.1.0", "1.0.1")
+        releases, _ = construct_releases(entries, app)
+        main = construct_archived_nodes(app, "changelog", releases, 1)
+        _, _, archived = app.releases_archives["changelog-1"]
+        assert isinstance(main[0][1], bullet_list)
+        assert isinstance(archived[0][1], bullet_list)
+        # So bug 2's entry got copied, not shared between both doctrees
+        assert archived[0][1][0] is not main[0][1][0]
+        assert archived[0][1][0].parent is archived[0][1]
@@ -0,0 +1,234 @@
+import os
+import pickle
+from unittest.mock import patch
+
+import releases
+from docutils.nodes import list_item, paragraph, Text
+
+from releases import construct_nodes, construct_releases
+from releases.checkpoints import CheckpointStore, dumps
+
+from _util import b, f, s, changelog2dict, make_app, release_list
+
+
+def _summarize(changelog):
+    return {
+        key: sorted(str(x.number) for x in value)
+        for key, value in changelog2dict(changelog).items()
+    }
+
+
+def _entries():
+    # NOTE: always fresh objects, as construct_releases() mutates them
+    return ("1.1.0", f(4), "1.0.1", b(3), b(2), "1.0.0", b(1))
+
+
+class checkpoints:
+    def _construct(self, tmpdir, *entries):
+        app = make_app(checkpoints=True, doctreedir=str(tmpdir))
+        return construct_releases(release_list(*entries), app)[0]
+
+    def _checkpoint_files(self, tmpdir):
+        return tmpdir.join("releases-checkpoints").listdir()
+
+    def disabled_by_default(self, tmpdir):
+        app = make_app(doctreedir=str(tmpdir))
+        construct_releases(release_list(*_entries()), app)
+        assert not tmpdir.join("releases-checkpoints").exists()
+
+    def saves_snapshots_at_newest_release_boundaries(self, tmpdir):
+        # Four releases (incl. the implicit initial one), of which the newest
+        # has no following entry to pin it down; 3 get checkpointed
+        self._construct(tmpdir, *_entries())
+        assert len(self._checkpoint_files(tmpdir)) == 3
+
+    def skips_releases_followed_by_releases(self, tmpdir):
+        self._construct(tmpdir, "1.1.0", "1.0.1", b(2), "1.0.0", b(1))
+        # Only the two 1.0.0s; 1.0.1 is part of a block with 1.1.0
+        assert len(self._checkpoint_files(tmpdir)) == 2
+
+    def resumed_build_matches_full_build(self, tmpdir):
+        expected = _summarize(self._construct(tmpdir, *_entries()))
+        with patch(
+            "releases.construct_entry_without_release",
+            wraps=releases.construct_entry_without_release,
+        ) as cewr:
+            result = _summarize(self._construct(tmpdir, *_entries()))
+        # Newest boundary (1.0.1) matched, so only f(4) got replayed
+        assert cewr.call_count == 1
+        assert result == expected
+
+    def only_new_entries_get_replayed(self, tmpdir):
+        self._construct(tmpdir, *_entries())
+
+        def newer():
+            return (b(6), "1.1.1", "1.0.2", b(5)) + _entries()
+
+        expected = _summarize(
+            construct_releases(release_list(*newer()), make_app())[0]
+        )
+        with patch(
+            "releases.construct_entry_without_release",
+            wraps=releases.construct_entry_without_release,
+        ) as cewr:
+            result = _summarize(self._construct(tmpdir, *newer()))
+        # Resumed from 1.0.1: f(4) plus the two new bugs
+        assert cewr.call_count == 3
+        assert result == expected
+
+    def changed_old_entries_invalidate_checkpoints(self, tmpdir):
+        self._construct(tmpdir, *_entries())
+        changed = ("1.1.0", f(4), "1.0.1", b(3), b(7), "1.0.0", b(1))
+        with patch(
+            "releases.construct_entry_without_release",
+            wraps=releases.construct_entry_without_release,
+        ) as cewr:
+            result = _summarize(self._construct(tmpdir, *changed))
+        # Explicit 1.0.0's checkpoint covers b(2), so everything after the
+        # implicit initial release got replayed
+        assert cewr.call_count == 4
+        assert result["1.0.1"] == ["3", "7"]
+
+    def new_major_release_atop_a_checkpoint(self, tmpdir):
+        def entries():
+            return ("1.1.0", f(3), "1.0.1", b(2))
+
+        self._construct(tmpdir, *entries())
+        # 2.0.0 joins 1.1.0's block, changing the lookahead done before it
+        result = self._construct(tmpdir, "2.0.0", *entries())
+        expected = construct_releases(
+            release_list("2.0.0", *entries()), make_app()
+        )[0]
+        assert _summarize(result) == _summarize(expected)
+
+    def restored_issues_use_current_entries(self, tmpdir):
+        self._construct(tmpdir, *_entries())
+        entries = release_list(*_entries())
+        app = make_app(checkpoints=True, doctreedir=str(tmpdir))
+        changelog = changelog2dict(construct_releases(entries, app)[0])
+        # Restored issues must wrap this build's (unresolved) nodes, not
+        # whatever an earlier build rendered them into
+        restored = changelog["1.0.0"] + changelog["1.0.1"]
+        assert restored
+        for issue in restored:
+            assert any(issue["description"] is x for x in entries)
+
+    def restored_issues_keep_shared_identity(self, tmpdir):
+        def entries():
+            return ("1.1.0", "1.0.1", f(3, backported=True), "1.0.0")
+
+        self._construct(tmpdir, *entries())
+        changelog = changelog2dict(self._construct(tmpdir, *entries()))
+        assert changelog["1.1.0"][0] is changelog["1.0.1"][0]
+
+    def loading_tolerates_concurrent_pruning(self, tmpdir):
+        store = CheckpointStore(str(tmpdir), make_app().config)
+        store.save("abc", {"x": 1})
+        with patch("os.utime", side_effect=FileNotFoundError):
+            assert store.load("abc") == {"x": 1}
+
+    def pruning_tolerates_concurrent_pruning(self, tmpdir):
+        store = CheckpointStore(str(tmpdir), make_app().config)
+
+        def fill():
+            for digest in range(25):
+                tmpdir.join(f"{digest}.pickle").write("")
+
+        real_getmtime, real_remove = os.path.getmtime, os.remove
+
+        def vanished(path):
+            # Some files get pruned by someone else while we're looking
+            if path.endswith("3.pickle"):
+                raise FileNotFoundError(path)
+            return real_getmtime(path)
+
+        def raced(path):
+            real_remove(path)
+            raise FileNotFoundError(path)
+
+        fill()
+        with patch("os.path.getmtime", side_effect=vanished):
+            store.prune()
+        fill()
+        with patch("os.remove", side_effect=raced):
+            store.prune()
+        assert len(tmpdir.listdir()) == 20
+
+    def node_pickling_drops_parent_pointers(self):
+        entries = release_list(b(1))
+        issue = entries[0][0][0]
+        issue.attributes["description"] = entries[0]
+        copy = pickle.loads(dumps(issue))
+        assert copy == issue
+        assert copy["description"].parent is None
+        assert copy["description"][0].parent is copy["description"]
+
+
+def _cached_entries():
+    # Fresh objects, incl. a plain (implicit bug) item & unreleased issues
+    plain = list_item("", paragraph("", "", Text("plain item")))
+    return (s(6), b(5), "1.1.0", f(4), "1.0.1", b(3), plain, "1.0.0", b(1))
+
+
+class cache:
+    def _construct(self, tmpdir, *entries, **kwargs):
+        app = make_app(cache=True, doctreedir=str(tmpdir), **kwargs)
+        return construct_releases(release_list(*entries), app)
+
+    def _uncached(self, *entries, **kwargs):
+        return construct_releases(release_list(*entries), make_app(**kwargs))
+
+    def disabled_by_default(self, tmpdir):
+        app = make_app(doctreedir=str(tmpdir))
+        construct_releases(release_list(*_cached_entries()), app)
+        assert not tmpdir.join("releases-cache").exists()
+
+    def unchanged_changelogs_skip_construction(self, tmpdir):
+        self._construct(tmpdir, *_cached_entries())
+        with patch("releases.construct_entry_without_release") as cewr:
+            with patch("releases.construct_entry_with_release") as cewr2:
+                releases, manager = self._construct(tmpdir, *_cached_entries())
+        assert not cewr.called and not cewr2.called
+        expected, expected_manager = self._uncached(*_cached_entries())
+        assert _summarize(releases) == _summarize(expected)
+        assert manager.snapshot() == expected_manager.snapshot()
+
+    def cached_results_render_identically(self, tmpdir):
+        self._construct(tmpdir, *_cached_entries())
+        releases, _ = self._construct(tmpdir, *_cached_entries())
+        expected, _ = self._uncached(*_cached_entries())
+        rendered = [x.pformat() for x in construct_nodes(releases)]
+        assert rendered == [x.pformat() for x in construct_nodes(expected)]
+
+    def shared_issues_keep_identity(self, tmpdir):
+        def entries():
+            return ("1.1.0", "1.0.1", f(3, backported=True), "1.0.0")
+
+        self._construct(tmpdir, *entries())
+        changelog = changelog2dict(self._construct(tmpdir, *entries())[0])
+        assert changelog["1.1.0"][0] is changelog["1.0.1"][0]
+
+    def works_under_unstable_prehistory(self, tmpdir):
+        def construct(**kwargs):
+            plain = list_item("", paragraph("", "", Text("plain item")))
+            entries = ("0.1.1", plain, "0.1.0", b(1))
+            app = make_app(unstable_prehistory=True, **kwargs)
+            return construct_releases(
+                release_list(*entries, skip_initial=True), app
+            )[0]
+
+        construct(cache=True, doctreedir=str(tmpdir))
+        releases = construct(cache=True, doctreedir=str(tmpdir))
+        rendered = [x.pformat() for x in construct_nodes(releases)]
+        expected = [x.pformat() for x in construct_nodes(construct())]
+        assert rendered == expected
+
+    def changed_entries_miss_the_cache(self, tmpdir):
+        self._construct(tmpdir, *_cached_entries())
+        with patch(
+            "releases.construct_entry_without_release",
+            wraps=releases.construct_entry_without_release,
+        ) as cewr:
+            result, _ = self._construct(tmpdir, b(7), *_cached_entries())
+        assert cewr.called
+        assert "7" in _summarize(result)["unreleased_1.x_bugfix"]
@@ -0,0 +1,137 @@
+import json
+import os
+from unittest.mock import patch
+
+from releases.cli import cache_key, load_changelog, main, pending_lines
+
+
+CHANGELOG = """
+=========
+Changelog
+=========
+
+- :bug:`5` Unreleased bugfix.
+- :feature:`4` Unreleased feature.
+- :release:`1.1.0 <2014-02-01>`
+- :release:`1.0.1 <2014-01-02>`
+- :feature:`3` A feature.
+- :bug:`2 major` A major bug.
+- :bug:`1` Fix a bug.
+- :release:`1.0.0 <2014-01-01>`
+"""
+
+
+def _changelog(tmpdir, text=CHANGELOG):
+    path = tmpdir.join("changelog.rst")
+    path.write(text)
+    return str(path)
+
+
+class load_changelog_:
+    def returns_export_style_records(self, tmpdir):
+        data = load_changelog(_changelog(tmpdir))
+        numbers = [x["number"] for x in data["releases"]]
+        assert numbers == [None, None, "1.1.0", "1.0.1", "1.0.0"]
+        assert list(data["buckets"]) == ["1"]
+
+    def caches_by_content_hash(self, tmpdir):
+        path = _changelog(tmpdir)
+        cache = tmpdir.join("cache")
+        first = load_changelog(path, cache_dir=str(cache))
+        assert len(cache.listdir()) == 1
+        with patch("releases.util.ChangelogParser") as parser:
+            assert load_changelog(path, cache_dir=str(cache)) == first
+        assert not parser.called
+        # Edits invalidate
+        _changelog(tmpdir, CHANGELOG.replace("1.1.0", "1.2.0"))
+        changed = load_changelog(path, cache_dir=str(cache))
+        assert changed["releases"][2]["number"] == "1.2.0"
+        assert len(cache.listdir()) == 2
+
+    @patch("releases.cli.CACHE_LIMIT", 2)
+    def prunes_least_recently_used_entries(self, tmpdir):
+        path = _changelog(tmpdir)
+        cache = tmpdir.join("cache")
+
+        def load(version):
+            before = set(cache.listdir()) if cache.exists() else set()
+            _changelog(tmpdir, CHANGELOG.replace("1.1.0", version))
+            load_changelog(path, cache_dir=str(cache))
+            return (set(cache.listdir()) - before).pop()
+
+        first, second = load("1.1.0"), load("1.2.0")
+        # Make mtimes unambiguous, then have a cache hit refresh the 1st one
+        os.utime(first, (1000, 1000))
+        os.utime(second, (2000, 2000))
+        _changelog(tmpdir)
+        load_changelog(path, cache_dir=str(cache))
+        load("1.3.0")
+        remaining = cache.listdir()
+        assert len(remaining) == 2
+        assert first in remaining and second not in remaining
+
+    def tolerates_concurrent_pruning(self, tmpdir):
+        path = _changelog(tmpdir)
+        cache = tmpdir.join("cache")
+        first = load_changelog(path, cache_dir=str(cache))
+        # Hit, whose file then vanishes before its mtime gets refreshed
+        with patch("os.utime", side_effect=FileNotFoundError):
+            assert load_changelog(path, cache_dir=str(cache)) == first
+        # Miss, with a cached file vanishing while pruning looks it over
+        _changelog(tmpdir, CHANGELOG.replace("1.1.0", "1.2.0"))
+        with patch("os.path.getmtime", side_effect=FileNotFoundError):
+            changed = load_changelog(path, cache_dir=str(cache))
+        assert changed["releases"][2]["number"] == "1.2.0"
+
+    def settings_are_part_of_cache_key(self):
+        assert cache_key(b"x", False, {}) != cache_key(b"x", True, {})
+        assert cache_key(b"x", False, {}) != cache_key(
+            b"x", False, {"unstable_prehistory": True}
+        )
+
+
+class pending_lines_:
+    def groups_unreleased_entries_by_line(self, tmpdir):
+        lines = pending_lines(load_changelog(_changelog(tmpdir)))
+        assert {k: [x["number"] for x in v] for k, v in lines.items()} == {
+            "1.x": ["4"],
+            "1.0": ["5"],
+            "1.1": ["5"],
+        }
+
+
+class main_:
+    def _run(self, capsys, tmpdir, *args):
+        code = main([args[0], _changelog(tmpdir), "--no-cache", *args[1:]])
+        out, err = capsys.readouterr()
+        return code, out, err
+
+    def lists_releases(self, capsys, tmpdir):
+        code, out, _ = self._run(capsys, tmpdir, "list")
+        assert code == 0
+        assert out.splitlines() == [
+            "1.1.0 2014-02-01",
+            "1.0.1 2014-01-02",
+            "1.0.0 2014-01-01",
+        ]
+
+    def shows_one_release(self, capsys, tmpdir):
+        _, out, _ = self._run(capsys, tmpdir, "show", "1.1.0")
+        assert out.splitlines() == [
+            "[feature] #3 A feature.",
+            "[bug] #2 (major) A major bug.",
+        ]
+
+    def shows_unreleased_entries_as_json(self, capsys, tmpdir):
+        _, out, _ = self._run(capsys, tmpdir, "unreleased", "--json")
+        data = json.loads(out)
+        assert [x["number"] for x in data["1.x"]] == ["4"]
+
+    def finds_releases_containing_issue(self, capsys, tmpdir):
+        _, out, _ = self._run(capsys, tmpdir, "find", "#1", "--json")
+        assert json.loads(out) == ["1.0.1"]
+
+    def reports_unknown_releases(self, capsys, tmpdir):
+        code, out, err = self._run(capsys, tmpdir, "show", "9.9.9")
+        assert code == 1
+        assert "No release '9.9.9'" in err
@@ -0,0 +1,98 @@
+import json
+from types import SimpleNamespace
+
+from pytest import raises
+
+from releases import construct_releases
+from releases.export import changelog_records, export_format, write_export
+
+from _util import b, f, make_app, release_list
+
+
+def _construct():
+    entries = release_list(
+        b(4), "1.1.0", f(3, backported=True), "1.0.1", b(2, spec="1.0+")
+    )
+    return construct_releases(entries, make_app())
+
+
+def _app(tmpdir, setting):
+    return SimpleNamespace(
+        config=SimpleNamespace(releases_export=setting), outdir=str(tmpdir)
+    )
+
+
+class changelog_records_:
+    def lists_releases_newest_first_with_issue_details(self):
+        records, _ = changelog_records(*_construct())
+        assert [x["line"] for x in records] == [
+            "unreleased_1.x_feature",
+            "unreleased_1.x_bugfix",
+            "1.1",
+            "1.0",
+            "1.0",
+        ]
+        assert [x["number"] for x in records[2:]] == [
+            "1.1.0",
+            "1.0.1",
+            "1.0.0",
+        ]
+        assert records[0]["unreleased"] and not records[2]["unreleased"]
+        assert records[2]["date"] == "2013-11-20"
+        assert records[2]["entries"] == [
+            {
+                "number": "3",
+                "type": "feature",
+                "backported": True,
+                "major": False,
+                "spec": None,
+                "description": "",
+            }
+        ]
+        assert records[3]["entries"] == [
+            {
+                "number": "2",
+                "type": "bug",
+                "backported": False,
+                "major": False,
+                "spec": ">=1.0",
+                "description": "",
+            }
+        ]
+
+    def includes_remaining_bucket_contents(self):
+        _, buckets = changelog_records(*_construct())
+        assert list(buckets) == ["1"]
+        assert [x["number"] for x in buckets["1"]["1.1"]] == ["4"]
+        # Backported feature 3 hasn't seen a 1.0.x release yet
+        assert [x["number"] for x in buckets["1"]["1.0"]] == ["3", "4"]
+        assert buckets["1"]["unreleased_feature"] == []
+
+
+class export_format_:
+    def is_off_by_default(self):
+        assert export_format(make_app().config) is None
+
+    def true_means_json(self):
+        assert export_format(make_app(export=True).config) == "json"
+
+    def rejects_unknown_formats(self):
+        with raises(ValueError):
+            export_format(make_app(export="yaml").config)
+
+
+class write_export_:
+    def writes_json_into_output_dir(self, tmpdir):
+        write_export(_app(tmpdir, "json"), "sub/changelog", *_construct())
+        path = tmpdir.join("sub", "changelog.releases.json")
+        data = json.loads(path.read())
+        assert set(data) == {"releases", "buckets"}
+        assert len(data["releases"]) == 5
+
+    def writes_ndjson_one_record_per_line(self, tmpdir):
+        write_export(_app(tmpdir, "ndjson"), "changelog", *_construct())
+        lines = tmpdir.join("changelog.releases.ndjson").read().splitlines()
+        records = [json.loads(x) for x in lines]
+        assert len(records) == 6
+        assert records[2]["number"] == "1.1.0"
+        assert records[-1]["family"] == "1"
@@ -0,0 +1,135 @@
+from types import SimpleNamespace
+
+from pytest import raises
+
+from releases.line_manager import Bucket, LineManager
+from releases.models import parse_spec
+
+from _util import b, f, s
+
+
+class Bucket_:
+    def setup_method(self):
+        self.b1, self.b2, self.b3 = b(1), b(2), b(3)
+        self.bucket = Bucket([self.b1, self.b2, self.b3])
+
+    def preserves_insertion_order(self):
+        assert list(self.bucket) == [self.b1, self.b2, self.b3]
+        self.bucket.remove(self.b2)
+        self.bucket.append(self.b2)
+        assert list(self.bucket) == [self.b1, self.b3, self.b2]
+
+    def compares_equal_to_lists(self):
+        assert Bucket() == []
+        assert self.bucket == [self.b1, self.b2, self.b3]
+        assert self.bucket[0] is self.b1
+
+    def membership_is_by_identity(self):
+        # Distinct but equal issues (e.g. un-numbered bugs) are both kept
+        one, two = b(0), b(0)
+        assert one == two
+        bucket = Bucket([one])
+        assert one in bucket
+        assert two not in bucket
+        bucket.append(two)
+        bucket.remove(two)
+        assert list(bucket) == [one]
+
+    def repeated_items_removed_one_at_a_time(self):
+        self.bucket.append(self.b1)
+        assert len(self.bucket) == 4
+        self.bucket.remove(self.b1)
+        assert list(self.bucket) == [self.b2, self.b3, self.b1]
+
+    def remove_raises_ValueError_when_absent(self):
+        with raises(ValueError):
+            self.bucket.remove(b(4))
+
+    def discard_ignores_absent_items(self):
+        self.bucket.discard(b(4))
+        self.bucket.discard(self.b3)
+        assert list(self.bucket) == [self.b1, self.b2]
+
+    def grouped_lists_by_type_in_insertion_order(self):
+        f1, s1, f2 = f(4), s(5), f(6)
+        for item in (s1, f1, f2):
+            self.bucket.append(item)
+        self.bucket.remove(self.b2)
+        assert self.bucket.grouped() == [f1, f2, self.b1, self.b3, s1]
+        # Plain iteration is unaffected
+        assert list(self.bucket) == [self.b1, self.b3, s1, f1, f2]
+
+    def copies_are_independent(self):
+        copy = self.bucket.copy()
+        copy.remove(self.b1)
+        assert self.b1 in self.bucket
+
+
+def _manager():
+    config = SimpleNamespace(releases_unstable_prehistory=False)
+    manager = LineManager(SimpleNamespace(config=config))
+    manager.add_family(1)
+    manager.add_family(2)
+    return manager
+
+
+class LineManager_:
+    def add_line_keeps_lines_sorted(self):
+        manager = _manager()
+        for line in ("1.10", "1.2", "1.9"):
+            manager.add_line(1, line)
+        assert manager.lines(1) == ["1.2", "1.9", "1.10"]
+        assert manager[1]["1.10"] == []
+        assert manager.lines(2) == []
+
+    def matching_lines_filters_families_and_lines(self):
+        manager = _manager()
+        for family, line in ((1, "1.0"), (1, "1.1"), (2, "2.0")):
+            manager.add_line(family, line)
+        assert manager.matching_lines(parse_spec(">=1.1")) == [
+            (1, ["1.1"]),
+            (2, ["2.0"]),
+        ]
+        assert manager.matching_lines(parse_spec(">=2")) == [(2, ["2.0"])]
+
+    def matching_lines_memoized_until_lines_change(self):
+        manager = _manager()
+        manager.add_line(1, "1.0")
+        spec = parse_spec(">=1.0")
+        first = manager.matching_lines(spec)
+        assert manager.matching_lines(spec) is first
+        manager.add_line(1, "1.1")
+        assert manager.matching_lines(spec) == [(1, ["1.0", "1.1"]), (2, [])]
+        manager.add_family(3)
+        assert manager.matching_lines(spec)[-1] == (3, [])
+
+    def restore_rebuilds_line_index(self):
+        manager = _manager()
+        manager.add_line(2, "2.0")
+        snapshot = manager.snapshot()
+        manager.add_line(2, "2.1")
+        manager.restore(snapshot)
+        assert manager.lines(2) == ["2.0"]
+        assert manager.matching_lines(parse_spec("")) == [
+            (1, []),
+            (2, ["2.0"]),
+        ]
+
+    def derived_state_tracks_families_and_lines(self):
+        config = SimpleNamespace(releases_unstable_prehistory=True)
+        manager = LineManager(SimpleNamespace(config=config))
+        manager.add_family(0)
+        assert manager.stable_families == []
+        assert manager.released_families == []
+        assert manager.unstable_prehistory
+        manager.add_family(1)
+        assert manager.stable_families == [1]
+        # 1.x family exists but hasn't had its 1.0.0 yet
+        assert not manager.has_stable_releases
+        manager.add_line(1, "1.0")
+        assert manager.released_families == [1]
+        assert manager.has_stable_releases
+        assert not manager.unstable_prehistory
+        manager.restore({0: {"unreleased": []}})
+        assert manager.stable_families == []
+        assert not manager.has_stable_releases
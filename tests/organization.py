@@ -2,7 +2,14 @@ from pytest import skip
 from pytest_relaxed import raises
 from docutils.nodes import list_item, raw, paragraph, Text
 
-from releases import Issue, construct_releases
+from releases import (
+    Issue,
+    Release,
+    construct_releases,
+    index_release_blocks,
+    scan_for_spec,
+)
+from releases.models import issue_key, parse_spec, parse_version
 
 from _util import (
     b,
@@ -568,3 +575,106 @@ class organization:
             # correctly - the explicitly listed issues don't appear in nearby
             # implicit releases.
             skip()
+
+
+class index_release_blocks_:
+    def _index(self, *entries):
+        # Given newest-first like a changelog; index works oldest-first.
+        stripped = [x[0][0] for x in reversed(release_list(*entries))]
+        return index_release_blocks(stripped)
+
+    def finds_majors_in_next_release_block(self):
+        index = self._index("2.0.0", "1.1.0", b(2), "1.0.1", b(1))
+        # [1.0.0, b1, 1.0.1, b2, 1.1.0, 2.0.0]
+        assert index == [(), (), (2,), (), (), ()]
+
+    def empty_while_inside_a_release_block(self):
+        index = self._index("3.0.0", "2.0.0", b(1))
+        # [1.0.0, b1, 2.0.0, 3.0.0]: only the release before b1 looks ahead
+        assert index == [(2, 3), (), (), ()]
+
+    def non_major_blocks_yield_nothing(self):
+        assert self._index("1.1.0", "1.0.1", b(1)) == [(), (), (), ()]
+
+    def empty_changelogs_are_fine(self):
+        assert index_release_blocks([]) == []
+
+
+class parsing:
+    def versions_are_memoized(self):
+        assert parse_version("1.2.3") is parse_version("1.2.3")
+        assert parse_version("1.2") is not parse_version("1.2.0")
+
+    def specs_are_memoized(self):
+        assert parse_spec(">=1.2") is parse_spec(">=1.2")
+        assert parse_spec("") is parse_spec("")
+        assert list(parse_spec("").filter([parse_version("1.0")]))
+
+    def scan_for_spec_shares_parsed_specs(self):
+        assert scan_for_spec("(1.2+)") is parse_spec(">=1.2")
+        assert scan_for_spec("(<2.0)") is scan_for_spec("(<2.0)")
+        assert scan_for_spec("backported") is None
+
+    def releases_keep_version_from_role_time(self):
+        obj = release_list("1.2.3", skip_initial=True)[0][0][0]
+        assert obj["version"] is parse_version("1.2.3")
+        assert obj.version is obj["version"]
+        assert obj.minor == "1.2"
+        assert obj.family == 1
+
+
+class records:
+    def issues_classify_once_at_creation(self):
+        issue = b(5, major=True)
+        assert issue.record.type == "bug"
+        assert issue.record.is_featurelike is True
+        assert f(6, backported=True).is_buglike
+
+    def copies_share_records(self):
+        issue = b(7, spec="1.2+")
+        assert issue.deepcopy().record is issue.record
+        release = release_list("1.2.3", skip_initial=True)[0][0][0]
+        assert release.copy().record is release.record
+
+    def classification_is_stored_only_in_records(self):
+        issue = b(5, major=True)
+        assert "major" not in issue.attributes
+        assert issue["major"] is True and issue["type_"] == "bug"
+        assert "number" in issue and issue.hasattr("type_")
+        assert 'number="5"' in issue.pformat()
+        release = release_list("1.2.3", skip_initial=True)[0][0][0]
+        assert "number" not in release.attributes
+        assert release["number"] == "1.2.3"
+
+    def setting_classification_replaces_the_record(self):
+        issue = b(5)
+        copy = issue.copy()
+        issue["major"] = True
+        assert issue.major and issue.is_featurelike
+        assert issue.key == ("bug", "5", False, True)
+        # Copies keep the record they had
+        assert not copy.major
+
+    def pseudo_releases_have_no_version_data(self):
+        obj = Release(number="unreleased_1.x_bugfix", date=None, nodelist=[])
+        assert obj.record.version is None
+        assert obj.minor is None
+        assert obj.family is None
+
+    def issues_have_cached_identity_keys(self):
+        issue = f(8, backported=True)
+        assert issue.key == ("feature", "8", True, False)
+        assert issue.key is issue.key
+        assert issue.key == issue_key("feature", "8", backported=True)
+
+    def equality_and_hashing_use_identity_keys(self):
+        assert b(9) == b(9)
+        assert b(9) != b(9, major=True)
+        assert b(9) != f(9)
+        assert hash(b(9)) == hash(issue_key("bug", "9"))
+        index = {x.key: x for x in (b(1), f(2), s(3))}
+        assert index[issue_key("feature", "2")] == f(2)
+
+    def equal_flag_pairs_do_not_collide(self):
+        # XOR-combining hashes used to make these (and many like them) clash
+        assert hash(b(1, major=True)) != hash(b(1, backported=True))
@@ -1,4 +1,6 @@
 from docutils.nodes import (
+    container,
+    image,
     reference,
     bullet_list,
     list_item,
@@ -8,9 +10,30 @@ from docutils.nodes import (
     Text,
 )
 
-from releases import Issue, construct_releases, construct_nodes
+from docutils.utils import new_document
+
+from releases import (
+    BulletListVisitor,
+    Issue,
+    UriTemplate,
+    construct_releases,
+    construct_nodes,
+    interpolate,
+    render_context,
+    reset_render_context,
+)
 
-from _util import b, f, s, entry, make_app, release, releases, setup_issues
+from _util import (
+    b,
+    f,
+    s,
+    entry,
+    make_app,
+    release,
+    release_list,
+    releases,
+    setup_issues,
+)
 
 
 def _obj2name(obj):
@@ -209,6 +232,59 @@ class presentation:
         _expect_type(p2[0], raw)
         assert p2[0].astext() == "y"
 
+    def single_appearances_reuse_original_description(self):
+        changelog = releases("1.0.2", self.b)
+        desc = self.b["description"]
+        node = construct_nodes(changelog)[0][1][0]
+        assert node is desc
+        assert "Bug" in node[0][0].astext()
+
+    def repeat_appearances_get_their_own_copies(self):
+        changelog = releases("1.1.0", "1.0.2", self.bf)
+        rendered = construct_nodes(changelog)
+        newest, older = rendered[0][1][0], rendered[1][1][0]
+        assert newest is self.bf["description"]
+        assert older is not newest
+        assert older[0] is not newest[0]
+        assert older.astext() == newest.astext()
+
+    class prerendering:
+        def _entries(self, *extra):
+            # Bug 2 appears in both 1.1.1 & 1.0.2; bug 1 in 1.1.0 & 1.0.1
+            return (
+                ("1.1.1", "1.0.2", b(2))
+                + extra
+                + (
+                    "1.1.0",
+                    f(3),
+                    "1.0.1",
+                    list_item("", paragraph("", "", b(1), literal("", "x()"))),
+                )
+            )
+
+        def _html(self, app, rendered):
+            return app.builder.render_partial(container("", *rendered))
+
+        def renders_html_builds_ahead_of_time(self):
+            app = make_app()
+            rendered = construct_nodes(
+                releases(*self._entries(), app=app), app=app
+            )
+            assert all(isinstance(x[1], raw) for x in rendered)
+            expected = construct_nodes(releases(*self._entries(), app=app))
+            assert self._html(app, rendered) == self._html(app, expected)
+
+        def skipped_for_entries_with_images(self):
+            app = make_app()
+            pic = list_item("", paragraph("", "", s(4), image(uri="x.png")))
+            changelog = releases(*self._entries(pic), app=app)
+            rendered = construct_nodes(changelog, app=app)
+            assert all(isinstance(x[1], bullet_list) for x in rendered)
+
+        def skipped_without_an_app(self):
+            rendered = construct_nodes(releases(*self._entries()))
+            assert all(isinstance(x[1], bullet_list) for x in rendered)
+
     def descriptions_are_parsed_for_issue_roles(self):
         item = list_item("", paragraph("", "", self.b.deepcopy(), s(5)))
         para = self._generate("1.0.2", item)[0]
@@ -285,3 +361,55 @@ class presentation:
         result = self._generate(*entries, app=app, raw=True, skip_initial=True)
         html = str(result[0][0][0])
         assert "Next release" in html
+
+
+class UriTemplate_:
+    def _check(self, template, number="15"):
+        compiled = UriTemplate(template)
+        assert compiled(number) == interpolate(template, number)
+        return compiled
+
+    def percent_s_templates_are_presplit(self):
+        assert self._check("bar_%s/x").pieces == ["bar_", None, "/x"]
+
+    def format_templates_are_presplit(self):
+        compiled = self._check("{{a}}/issue_{number}/{number}")
+        assert compiled.pieces.count(None) == 2
+        assert compiled("15") == "{a}/issue_15/15"
+
+    def tricky_templates_fall_back_to_interpolation(self):
+        for template in ("100%% %s", "{number:>5}", "{number!r}"):
+            assert self._check(template).pieces is None
+
+
+class render_context_:
+    def is_created_once_per_app(self):
+        app = make_app()
+        assert render_context(app) is render_context(app)
+
+    def reset_recompiles_from_current_config(self):
+        app = make_app()
+        context = render_context(app)
+        app.config.releases_issue_uri = "new_{number}"
+        assert render_context(app) is context
+        fresh = reset_render_context(app)
+        assert fresh is not context
+        assert fresh.issue_uri("3") == "new_3"
+
+
+class BulletListVisitor_:
+    def stops_walking_once_changelog_is_replaced(self):
+        app = make_app()
+        doctree = new_document("changelog")
+        changelog = bullet_list("", *release_list("1.0.1", b(1)))
+        trailing = bullet_list("", list_item("", paragraph("", "not me")))
+        doctree.extend([changelog, trailing])
+        visitor = BulletListVisitor(doctree, app, ["changelog"], False)
+        visited = []
+        visitor.unknown_visit = visited.append
+        assert doctree.walk(visitor) is True
+        assert visitor.found_changelog
+        assert all(x is not changelog for x in doctree.children)
+        assert doctree[-1] is trailing  # untouched
+        # Only the document itself was visited before the changelog list
+        assert visited == [doctree]
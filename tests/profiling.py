@@ -0,0 +1,100 @@
+import json
+from types import SimpleNamespace
+
+from releases import construct_nodes, construct_releases, profiling
+
+from _util import b, f, make_app, release_list
+
+
+def _entries():
+    # One bug landing in two release lines -> one extra (deep-copied) render
+    return ("1.1.1", "1.0.1", b(3), "1.1.0", f(2), "1.0.0")
+
+
+def _build_app(tmpdir, setting):
+    return SimpleNamespace(
+        config=SimpleNamespace(releases_profile=setting), outdir=str(tmpdir)
+    )
+
+
+class profiled_:
+    def nothing_is_recorded_by_default(self):
+        construct_releases(release_list(*_entries()), make_app())
+        assert profiling.active is None
+
+    def records_phase_timings(self):
+        entries = release_list(*_entries())
+        with profiling.profiled() as profile:
+            releases, _ = construct_releases(entries, make_app())
+            construct_nodes(releases)
+        phases = profile.report()["phases"]
+        for name in ("construct_releases", "construct_nodes"):
+            assert phases[name]["calls"] == 1
+            assert phases[name]["seconds"] > 0
+
+    def times_role_invocations(self):
+        with profiling.profiled() as profile:
+            b(1)
+            f(2)
+        assert profile.report()["phases"]["roles"]["calls"] == 2
+
+    def counts_hot_operations(self):
+        entries = release_list(*_entries())
+        app = make_app()
+        with profiling.profiled() as profile:
+            releases, _ = construct_releases(entries, app)
+            construct_nodes(releases)
+        counters = profile.report()["counters"]
+        # 6 explicit entries plus the implicit 1.0.0
+        assert counters["entries_processed"] == 7
+        assert counters["deepcopies"] == 1
+        assert counters["spec_filters"] > 0
+        assert counters["bucket_insertions"] > 0
+        assert counters["bucket_removals"] > 0
+
+    def restores_previous_profile_on_exit(self):
+        with profiling.profiled() as outer:
+            with profiling.profiled() as inner:
+                assert profiling.active is inner
+            assert profiling.active is outer
+        assert profiling.active is None
+
+
+class build_profile:
+    def teardown_method(self):
+        profiling.active = None
+
+    def does_nothing_when_disabled(self, tmpdir):
+        app = _build_app(tmpdir, False)
+        profiling.start_build_profile(app)
+        assert profiling.active is None
+        profiling.finish_build_profile(app, None)
+        assert not tmpdir.listdir()
+
+    def writes_json_report_into_output_dir(self, tmpdir):
+        app = _build_app(tmpdir, True)
+        profiling.start_build_profile(app)
+        profiling.count("deepcopies", 3)
+        profiling.finish_build_profile(app, None)
+        assert profiling.active is None
+        path = tmpdir.join(profiling.REPORT_FILENAME)
+        report = json.loads(path.read())
+        assert report["counters"] == {"deepcopies": 3}
+
+    def hands_report_to_callable_setting(self, tmpdir):
+        reports = []
+        app = _build_app(tmpdir, reports.append)
+        profiling.start_build_profile(app)
+        profiling.count("entries_processed")
+        profiling.finish_build_profile(app, None)
+        assert reports == [
+            {"phases": {}, "counters": {"entries_processed": 1}}
+        ]
+        assert not tmpdir.listdir()
+
+    def skips_report_for_failed_builds(self, tmpdir):
+        app = _build_app(tmpdir, True)
+        profiling.start_build_profile(app)
+        profiling.finish_build_profile(app, Exception("nope"))
+        assert profiling.active is None
+        assert not tmpdir.listdir()
@@ -0,0 +1,56 @@
+from releases import construct_releases
+from releases.query import ChangelogIndex
+
+from _util import b, f, make_app, release_list
+
+
+def _index():
+    entries = release_list(
+        b(5), f(4), "1.1.1", "1.0.2", b(3), "1.1.0", f(2), "1.0.1", b(1)
+    )
+    return ChangelogIndex(*construct_releases(entries, make_app()))
+
+
+class ChangelogIndex_:
+    def maps_releases_to_their_issues(self):
+        index = _index()
+        assert index.release_numbers == [
+            "1.0.0",
+            "1.0.1",
+            "1.1.0",
+            "1.0.2",
+            "1.1.1",
+        ]
+        assert [x.number for x in index.release("1.1.0")] == ["2"]
+        assert index.release("1.0.0") == []
+
+    def maps_issues_to_releases_newest_first(self):
+        index = _index()
+        # Bug 3 went out in both the 1.0.x & 1.1.x lines
+        assert index.releases_containing("3") == ["1.1.1", "1.0.2"]
+        assert index.releases_containing(1) == ["1.0.1"]
+        assert index.releases_containing("#2") == ["1.1.0"]
+        assert index.releases_containing("99") == []
+
+    def maps_issues_to_pending_lines(self):
+        index = _index()
+        assert index.lines_containing(5) == ["1.0", "1.1"]
+        assert index.lines_containing(4) == ["1.x"]
+        assert index.lines_containing(3) == []
+
+    def maps_lines_to_released_and_pending_issues(self):
+        index = _index()
+        assert index.lines == ["1.0", "1.1", "1.x"]
+        assert [x.number for x in index.released("1.0")] == ["1", "3"]
+        assert [x.number for x in index.released("1.1")] == ["2", "3"]
+        assert [x.number for x in index.pending("1.1")] == ["5"]
+        assert [x.number for x in index.pending("1.x")] == ["4"]
+        assert index.pending("9.9") == []
+
+    def finds_issue_objects_by_number(self):
+        index = _index()
+        (issue,) = index.issues(3)
+        assert issue.type == "bug"
+        assert index.release("1.0.2")[0] is issue
+        assert index.release("1.1.1")[0] is issue
+        assert index.issues(42) == []
@@ -0,0 +1,82 @@
+import io
+import json
+from unittest.mock import patch
+
+from releases import construct_releases
+from releases.trace import NULL_TRACER, Tracer
+
+from _util import b, f, make_app, release_list
+
+
+def _events(text):
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class Tracer_:
+    def writes_buffered_ndjson(self):
+        stream = io.StringIO()
+        tracer = Tracer(stream)
+        tracer.emit("family_added", family=1)
+        tracer.emit("issue_added", issue=b(5), family=1, bucket="1.0")
+        assert stream.getvalue() == ""
+        tracer.flush()
+        assert _events(stream.getvalue()) == [
+            {"event": "family_added", "family": 1},
+            {
+                "event": "issue_added",
+                "issue": {"type": "bug", "number": "5"},
+                "family": 1,
+                "bucket": "1.0",
+            },
+        ]
+
+    def flushes_when_buffer_fills(self):
+        stream = io.StringIO()
+        tracer = Tracer(stream)
+        with patch("releases.trace.BUFFER_SIZE", 2):
+            tracer.emit("one")
+            assert stream.getvalue() == ""
+            tracer.emit("two")
+        assert len(_events(stream.getvalue())) == 2
+
+    def null_tracer_is_falsey_and_does_nothing(self):
+        assert not NULL_TRACER
+        NULL_TRACER.emit("whatever", anything=object())
+        NULL_TRACER.flush()
+
+
+class construct_releases_tracing:
+    def _events(self, capsys, **kwargs):
+        entries = release_list("1.0.1", b(2), "1.0.0", f(1), skip_initial=True)
+        construct_releases(entries, make_app(**kwargs))
+        return _events(capsys.readouterr().err)
+
+    def silent_unless_debug_enabled(self, capsys):
+        assert self._events(capsys) == []
+
+    def traces_bucket_movements(self, capsys):
+        events = self._events(capsys, debug=True)
+        assert events[0] == {"event": "family_added", "family": 1}
+        consumed = [x for x in events if x["event"] == "release_consumed"]
+        assert consumed == [
+            {
+                "event": "release_consumed",
+                "release": "1.0.0",
+                "family": 1,
+                "bucket": "unreleased_feature",
+                "issues": [{"type": "feature", "number": "1"}],
+            },
+            {
+                "event": "release_consumed",
+                "release": "1.0.1",
+                "family": 1,
+                "bucket": "1.0",
+                "issues": [{"type": "bug", "number": "2"}],
+            },
+        ]
+        added = [
+            x["bucket"]
+            for x in events
+            if x["event"] == "issue_added" and x["issue"]["number"] == "2"
+        ]
+        assert added == ["1.0", "unreleased_bugfix"]
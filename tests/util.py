@@ -1,11 +1,14 @@
 from pathlib import Path
 from unittest.mock import patch, MagicMock as Mock
 
-from pytest import skip  # noqa
+from pytest import raises, skip  # noqa
 from sphinx.application import Sphinx
 from docutils.nodes import bullet_list
 
+from releases.checkpoints import CheckpointStore
 from releases.util import (
+    ChangelogParser,
+    DocutilsApp,
     make_app,
     parse_changelog,
     get_doctree,
@@ -56,22 +59,93 @@ class parse_changelog_:
             manager = {
                 "1": {
                     "unreleased_bugfix": None,
-                    "unreleased_feature": "shiny!",
-                    "1.2": "hmm",
+                    "unreleased_feature": ["shiny!"],
+                    "1.2": ["hmm"],
+                },
+                "2": {
+                    "unreleased_feature": ["shinier!"],
+                    "2.2": ["also hmm"],
                 },
-                "2": {"unreleased_feature": "shinier!", "2.2": "also hmm"},
             }
             return manager
 
         result, _ = self._test(extra_setup)
         assert result == {
-            "1.2": "hmm",
+            "1.2": ["hmm"],
             "1.2.3": "stuff!",
-            "2.2": "also hmm",
-            "unreleased_1_feature": "shiny!",
-            "unreleased_2_feature": "shinier!",
+            "2.2": ["also hmm"],
+            "unreleased_1_feature": ["shiny!"],
+            "unreleased_2_feature": ["shinier!"],
         }
 
+    @patch("releases.util.construct_releases")
+    @patch("releases.util.get_doctree")
+    @patch("releases.util.get_docutils_doctree")
+    def can_skip_sphinx(self, get_docutils_doctree, get_doctree, construct):
+        app, doctree = Mock(name="app"), Mock(name="doctree")
+        doctree.__getitem__.return_value = [Mock(spec=bullet_list())]
+        get_docutils_doctree.return_value = app, doctree
+        construct.return_value = [], []
+        parse_changelog("random/changelog.rst", sphinx=False, kwarg="value")
+        get_docutils_doctree.assert_called_once_with(
+            "random/changelog.rst", kwarg="value"
+        )
+        assert not get_doctree.called
+
+
+class ChangelogParser_:
+    @patch("releases.util._changelog_from_doctree")
+    @patch("releases.util._read_doctree")
+    @patch("releases.util.make_app")
+    def sets_up_app_once_for_many_parses(self, make_app, read, from_doctree):
+        parser = ChangelogParser(kwarg="value")
+        make_app.assert_called_once_with(kwarg="value")
+        app = make_app.return_value
+        for name in ("one", "two"):
+            result = parser.parse(f"random/{name}.rst")
+            assert result is from_doctree.return_value
+            from_doctree.assert_called_with(
+                app, read.return_value, index=False
+            )
+        assert make_app.call_count == 1
+        assert read.call_count == 2
+        # Per-document state is cleaned up after each read
+        assert app.env.clear_doc.call_count == 2
+
+    @patch("releases.util._publish_doctree")
+    @patch("releases.util.DocutilsApp")
+    @patch("releases.util.make_app")
+    def can_skip_sphinx(self, make_app, DocutilsApp, publish):
+        parser = ChangelogParser(sphinx=False)
+        parser.get_doctree("random/changelog.rst")
+        assert not make_app.called
+        publish.assert_called_once_with(
+            DocutilsApp.return_value, Path("random/changelog.rst")
+        )
+
+
+class DocutilsApp_:
+    def has_default_releases_config(self):
+        app = DocutilsApp()
+        assert app.config.releases_document_name == ["changelog"]
+        assert app.config.releases_unstable_prehistory is False
+        assert "releases_debug" in app.config.values
+
+    def unused_kwargs_become_releases_config_options(self):
+        app = DocutilsApp(debug=True, issue_uri="issue_{number}")
+        assert app.config.releases_debug is True
+        assert app.config.releases_issue_uri == "issue_{number}"
+
+    def exposes_itself_via_env_like_sphinx(self):
+        app = DocutilsApp()
+        assert app.env.app is app
+
+    def checkpointing_requires_a_doctreedir(self, tmpdir):
+        with raises(ValueError, match="doctreedir"):
+            CheckpointStore.from_app(DocutilsApp(checkpoints=True))
+        app = DocutilsApp(checkpoints=True, doctreedir=str(tmpdir))
+        assert CheckpointStore.from_app(app).directory.startswith(str(tmpdir))
+
 
 class get_doctree_:
     def setup_method(self):